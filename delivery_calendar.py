@@ -1,114 +1,305 @@
 import os
 import argparse
-import time
-import schedule
-from scrapers.amazon import AmazonScraper
-from scrapers.ikea import IkeaScraper
-from ics import Calendar, Event
-from datetime import datetime, date
+import asyncio
+import hashlib
+import importlib
+from datetime import datetime, date, timezone
 
 
-def generate_ics_file(orders, output_file):
-    """Generate an ICS calendar file from combined orders using the ics library."""
-    cal = Calendar()
+PRODID = "-//delivery-calendar//Delivery Calendar//EN"
+DEFAULT_MAX_CONCURRENT_SCRAPERS = 8
+
+# Supported retailers: scraper keyword arguments mapped to the environment
+# variables that supply them. A retailer runs only when all its credentials
+# are set; options are passed through even when unset. Scraper classes are
+# given as "module:Class" and only imported for retailers that will run.
+SCRAPERS = [
+    {
+        'name': "Amazon",
+        'cls': "scrapers.amazon:AmazonScraper",
+        'credentials': {'email': "AMAZON_EMAIL", 'password': "AMAZON_PASSWORD"},
+        'options': {'totp_secret': "AMAZON_TOTP_SECRET"},
+    },
+    {
+        'name': "IKEA",
+        'cls': "scrapers.ikea:IkeaScraper",
+        'credentials': {'email': "IKEA_EMAIL", 'password': "IKEA_PASSWORD"},
+    },
+]
+
+
+def _load_class(path):
+    """Import a class from a "module:Class" path."""
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _escape_text(value):
+    """Escape a TEXT property value per RFC 5545."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold_line(line):
+    """Fold a content line into chunks of at most 75 octets per RFC 5545."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+
+    chunks = []
+    current = ""
+    current_size = 0
+    for char in line:
+        size = len(char.encode("utf-8"))
+        # Continuation lines start with a space, which counts towards the limit
+        limit = 75 if not chunks else 74
+        if current_size + size > limit:
+            chunks.append(current)
+            current, current_size = "", 0
+        current += char
+        current_size += size
+    chunks.append(current)
+    return "\r\n ".join(chunks)
+
+
+def _format_date_property(name, value):
+    """Format a DTSTART/DTEND line; dates become all-day VALUE=DATE values."""
+    # datetime subclasses date, so compare exact types to spot pure dates
+    if type(value) is date:
+        return f"{name};VALUE=DATE:{value.strftime('%Y%m%d')}"
+    # Delivery windows are local times, so emit them as floating times
+    return f"{name}:{value.strftime('%Y%m%dT%H%M%S')}"
+
+
+def _event_key(order):
+    """Identify an order's event independently of its position on the page."""
+    # Orders are identified by their link or real order number, falling back
+    # to the raw delivery text; never by their position on the page, which
+    # shifts between runs. The item index keeps identical products in one
+    # order apart.
+    source = order.get('order_link') or order.get('order_id') or order.get('status', '')
+    return f"{source}|{order['title']}|{order.get('item_index', 0)}"
+
+
+def _event_uid(key, occurrence=0):
+    """
+    Derive a stable event UID so calendar clients can match events across runs.
+    
+    Args:
+        key: The order's event key from _event_key
+        occurrence: How many earlier events in the calendar share the key;
+            UIDs must be unique within a calendar
+    """
+    if occurrence:
+        key = f"{key}|{occurrence}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + "@delivery-calendar"
+
+
+def _event_lines(order, uid, dtstamp):
+    """Yield the unfolded content lines of one order's VEVENT."""
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{dtstamp}"
+    yield _format_date_property("DTSTART", order['start_date'])
+    
+    # End dates from the parsers are already exclusive
+    if order.get('end_date'):
+        yield _format_date_property("DTEND", order['end_date'])
+    
+    yield f"SUMMARY:{_escape_text(order['title'])}"
+    
+    if order.get('order_link'):
+        yield f"DESCRIPTION:{_escape_text('Order details: ' + order['order_link'])}"
+    
+    yield "END:VEVENT"
+
+
+def generate_ics_file(orders, output_file, state_dir="state"):
+    """
+    Generate an ICS calendar file from combined orders.
+    
+    The file is left untouched when its events are unchanged since the last
+    write, which is tracked by a content hash kept in state_dir rather than
+    next to the published calendar.
+    
+    Args:
+        orders: Scraped orders; those without a start_date are skipped
+        output_file: Path of the calendar file to write
+        state_dir: Private directory for the content hash
     
+    Returns:
+        True if the calendar was written, False if it was already up to date
+    """
+    dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}"]
+    
+    # Orders without an id can share a key, e.g. two IKEA orders with the
+    # same title and status, so number repeats to keep UIDs unique
+    occurrences = {}
     for order in orders:
         if order.get('start_date'):
-            event = Event()
-            event.name = order['title']
-            event.begin = order['start_date']
-            
-            if order.get('end_date'):
-                event.end = order['end_date']
-            
-            if order.get('order_link'):
-                event.description = f"Order details: {order['order_link']}"
-            
-            # Only make all-day if we don't have specific times
-            if isinstance(order['start_date'], date) and not isinstance(order['start_date'], datetime):
-                event.make_all_day()
-            
-            cal.events.add(event)
-    
-    with open(output_file, 'w') as f:
-        f.writelines(cal)
-
-
-def run_check():
+            key = _event_key(order)
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            lines.extend(_event_lines(order, _event_uid(key, occurrence), dtstamp))
+    
+    lines.append("END:VCALENDAR")
+    
+    # DTSTAMP changes on every run, so leave it out of the change check
+    content_hash = hashlib.blake2b(
+        "\n".join(line for line in lines if not line.startswith("DTSTAMP:")).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+    hash_file = os.path.join(state_dir, os.path.basename(output_file) + ".hash")
+    if os.path.exists(output_file) and os.path.exists(hash_file):
+        with open(hash_file) as f:
+            if f.read().strip() == content_hash:
+                return False
+    
+    # Encode the whole calendar once and hand it to the OS in a single
+    # binary write, bypassing the text layer's newline and locale handling
+    payload = "".join(_fold_line(line) + "\r\n" for line in lines).encode("utf-8")
+    
+    # Write to a sibling file and swap it in so calendar clients polling the
+    # output never see a partially written calendar
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, output_file)
+    
+    os.makedirs(state_dir, mode=0o700, exist_ok=True)
+    with open(hash_file, 'w') as f:
+        f.write(content_hash)
+    return True
+
+
+def _max_concurrent_scrapers():
+    """Read the MAX_CONCURRENT_SCRAPERS limit, defaulting to 8 and never below 1."""
+    value = os.getenv("MAX_CONCURRENT_SCRAPERS", "")
+    try:
+        limit = int(value)
+    except ValueError:
+        if value:
+            print(f"⚠️ Ignoring invalid MAX_CONCURRENT_SCRAPERS={value!r}, using {DEFAULT_MAX_CONCURRENT_SCRAPERS}")
+        return DEFAULT_MAX_CONCURRENT_SCRAPERS
+    # A limit of 0 would leave every scraper waiting on the semaphore forever
+    return max(limit, 1)
+
+
+async def run_check(share_browser=False):
+    """
+    Scrape all configured retailers and regenerate the combined calendar.
+    
+    By default each scraper launches its own browser and they run
+    concurrently, at most MAX_CONCURRENT_SCRAPERS (default 8) at a time.
+    With share_browser, a single Chrome instance is launched and lent to
+    each scraper in turn, trading wall-clock time for lower memory use.
+    """
     print("--- Starting Daily Delivery Check ---")
     output_dir = "./output"
     os.makedirs(output_dir, exist_ok=True)
+    # Session cookies and browser profiles stay out of output_dir, which may
+    # be served publicly
+    state_dir = "./state"
     
     all_orders = []
+    # Resolve every configured retailer before launching any browser
+    retailers = []
+    for retailer in SCRAPERS:
+        credentials = {arg: os.getenv(env) for arg, env in retailer['credentials'].items()}
+        if not all(credentials.values()):
+            print(f"⚠️ {retailer['name']} credentials not found. Skipping.")
+            continue
 
-    # --- Amazon ---
-    amazon_email = os.getenv("AMAZON_EMAIL")
-    amazon_password = os.getenv("AMAZON_PASSWORD")
-    amazon_totp_secret = os.getenv("AMAZON_TOTP_SECRET")
-
-    if amazon_email and amazon_password:
-        amazon_scraper = AmazonScraper(
-            email=amazon_email,
-            password=amazon_password,
-            totp_secret=amazon_totp_secret,
-            output_dir=output_dir
-        )
-        amazon_orders = amazon_scraper.run()
-        if amazon_orders:
-            all_orders.extend(amazon_orders)
-            print(f"✔️ Successfully scraped {len(amazon_orders)} Amazon orders")
+        options = {arg: os.getenv(env) for arg, env in retailer.get('options', {}).items()}
+        retailers.append((retailer['name'], _load_class(retailer['cls']), {
+            **credentials,
+            **options,
+            'output_dir': output_dir,
+            'state_dir': state_dir,
+        }))
+
+    def collect(name, orders):
+        if orders:
+            all_orders.extend(orders)
+            print(f"✔️ Successfully scraped {len(orders)} {name} orders")
         else:
-            print("❌ Amazon scraping failed or no orders found")
-    else:
-        print("⚠️ Amazon credentials not found. Skipping.")
+            print(f"❌ {name} scraping failed or no orders found")
+
+    if share_browser and retailers:
+        from scrapers.base import create_driver
+        driver = create_driver()
+        # One browser can only drive one site at a time
+        try:
+            for name, scraper_cls, kwargs in retailers:
+                try:
+                    scraper = scraper_cls(**kwargs, driver=driver)
+                    collect(name, await asyncio.to_thread(scraper.run))
+                except Exception as e:
+                    print(f"❌ {name} scraper crashed: {e}")
+                # Don't hand one retailer's session to the next; WebDriver's
+                # delete_all_cookies() only covers the current domain, so clear
+                # every domain's cookies through Chrome DevTools instead
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        finally:
+            driver.quit()
+    elif retailers:
+        scrapers = [(name, scraper_cls(**kwargs)) for name, scraper_cls, kwargs in retailers]
+        # Scrapers spend most of their time waiting on the browser, so run
+        # their blocking run() calls concurrently in worker threads, capped
+        # so a long retailer list doesn't launch a browser per retailer at once
+        semaphore = asyncio.Semaphore(_max_concurrent_scrapers())
 
-    # --- IKEA ---
-    ikea_email = os.getenv("IKEA_EMAIL")
-    ikea_password = os.getenv("IKEA_PASSWORD")
+        async def guarded(scraper):
+            async with semaphore:
+                return await asyncio.to_thread(scraper.run)
 
-    if ikea_email and ikea_password:
-        ikea_scraper = IkeaScraper(
-            email=ikea_email,
-            password=ikea_password,
-            output_dir=output_dir
+        results = await asyncio.gather(
+            *(guarded(scraper) for _, scraper in scrapers),
+            return_exceptions=True
         )
-        ikea_orders = ikea_scraper.run()
-        if ikea_orders:
-            all_orders.extend(ikea_orders)
-            print(f"✔️ Successfully scraped {len(ikea_orders)} IKEA orders")
-        else:
-            print("❌ IKEA scraping failed or no orders found")
-    else:
-        print("⚠️ IKEA credentials not found. Skipping.")
+        for (name, _), result in zip(scrapers, results):
+            if isinstance(result, BaseException):
+                print(f"❌ {name} scraper crashed: {result}")
+            else:
+                collect(name, result)
 
     # Generate combined calendar file
     if all_orders:
         output_file = os.path.join(output_dir, "calendar.ics")
-        generate_ics_file(all_orders, output_file)
-        print(f"📅 Generated calendar with {len(all_orders)} total orders: {output_file}")
+        if generate_ics_file(all_orders, output_file, state_dir):
+            print(f"📅 Generated calendar with {len(all_orders)} total orders: {output_file}")
+        else:
+            print(f"📅 Calendar unchanged ({len(all_orders)} total orders): {output_file}")
     else:
         print("⚠️ No orders found from any retailer")
 
     print("--- Daily Delivery Check Finished ---")
 
 
+async def scheduler_loop(interval_hours, share_browser=False):
+    """Run a check immediately, then once every interval_hours after each run finishes."""
+    while True:
+        # A failed check (e.g. Chrome failing to start) must not end the loop
+        try:
+            await run_check(share_browser=share_browser)
+        except Exception as e:
+            print(f"❌ Delivery check failed: {e}")
+        await asyncio.sleep(interval_hours * 3600)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Delivery calendar generator")
     parser.add_argument("--interval", type=int, default=24,
                        help="Polling interval in hours (default: 24)")
+    parser.add_argument("--share-browser", action="store_true",
+                       help="Run scrapers one after another in a single browser to save memory")
     args = parser.parse_args()
 
-    # Run the check once immediately
-    run_check()
-
-    # Schedule recurring checks
-    schedule.every(args.interval).hours.do(run_check)
     print(f"Daily Delivery Check scheduled to run every {args.interval} hours.")
     print("Press Ctrl+C to stop the scheduler.")
-
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    asyncio.run(scheduler_loop(args.interval, args.share_browser))
 
 
 if __name__ == "__main__":
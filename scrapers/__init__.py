@@ -2,8 +2,23 @@
 Scrapers package for order tracking from various retailers.
 """
 
-from .base import Scraper
-from .amazon import AmazonScraper
-from .ikea import IkeaScraper
+import importlib
 
-__all__ = ['Scraper', 'AmazonScraper', 'IkeaScraper']
+__all__ = ['Scraper', 'create_driver', 'AmazonScraper', 'IkeaScraper']
+
+# Retailer modules pull in their own parsing dependencies, so they are only
+# imported when one of their names is first accessed
+_LAZY_IMPORTS = {
+    'Scraper': '.base',
+    'create_driver': '.base',
+    'AmazonScraper': '.amazon',
+    'IkeaScraper': '.ikea',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -3,166 +3,247 @@ Amazon scraper implementation.
 """
 
 import re
+import functools
+from urllib.parse import urlsplit, parse_qs
 import pyotp
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-from ics import Calendar, Event
-from datetime import datetime, date, timedelta
+from bs4 import BeautifulSoup, SoupStrainer
+from datetime import datetime, date, time, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Union
 
 from .base import Scraper
 
 
-def parse_delivery_date(delivery_date_str):
+# The patterns below are case-insensitive so status text can be matched
+# as scraped, without allocating a lowercased copy first
+
+# Anchored "DD Month [YYYY]"
+DAY_MONTH_RE = re.compile(r'^\s*(\d{1,2})\s+([a-z]+)(?:\s+(\d{4}))?\s*$', re.ASCII | re.IGNORECASE)
+
+# Time window such as "10am - 2pm" or "10:30am-2:30pm"
+# Groups: start hour, minute, meridiem, then the same for the end
+TIME_RANGE_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap]m)\s*[-–]\s*(\d{1,2})(?::(\d{2}))?\s*([ap]m)', re.IGNORECASE)
+
+NOW_EXPECTED_RE = re.compile(r'now expected by', re.IGNORECASE)
+
+# Status words preceding a date, e.g. "Arriving 16 July"
+STATUS_PREFIX_RE = re.compile(r'(?:arriving|delivered) ', re.IGNORECASE)
+
+# Module-level bindings for names used on every parse
+_combine = datetime.combine
+_ONE_DAY = timedelta(days=1)
+# Offsets for "next <weekday>", which is always 1 to 7 days ahead
+_DAYS_AHEAD = tuple(timedelta(days=i) for i in range(8))
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["january", "february", "march", "april", "may", "june",
+          "july", "august", "september", "october", "november", "december"]
+
+# Lookup tables replacing linear weekday scans and strptime month parsing.
+# Months are keyed by both full and abbreviated names ("july" and "jul").
+WEEKDAY_INDEX = {name: i for i, name in enumerate(WEEKDAYS)}
+MONTH_INDEX = {
+    **{name: i for i, name in enumerate(MONTHS, start=1)},
+    **{name[:3]: i for i, name in enumerate(MONTHS, start=1)},
+}
+
+# Relative-date keywords, found in a single pass over the status text
+KEYWORD_RE = re.compile(r'\b(today|tomorrow|arriving|' + '|'.join(WEEKDAYS) + r')\b', re.IGNORECASE)
+
+# Serialise only the order cards in the browser, in a single round trip,
+# rather than pulling the whole page through driver.page_source. The search
+# is scoped to the orders container when the page has one.
+ORDER_CARDS_SCRIPT = (
+    "const root = document.getElementById('ordersContainer') || document;"
+    "return Array.from(root.querySelectorAll('div.a-box-group.a-spacing-base'), "
+    "card => card.outerHTML).join('');"
+)
+
+
+def _clock_time(hour_str, minute_str, meridiem):
+    """
+    Convert 12-hour clock parts such as ("10", "30", "am") to a time.
+    Returns None when the hour or minute is out of range.
+    """
+    hour = int(hour_str)
+    minute = int(minute_str) if minute_str else 0
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+
+    hour %= 12
+    if meridiem.lower() == 'pm':
+        hour += 12
+    return time(hour, minute)
+
+
+def _parse_day_month(text, default_year):
+    """
+    Parse a "DD Month [YYYY]" string such as "19 July" or "14 Jul 2025".
+    Returns a date, using default_year when no year is given, or None.
+    """
+    match = DAY_MONTH_RE.match(text)
+    if not match:
+        return None
+
+    day_str, month_str, year_str = match.groups()
+    month = MONTH_INDEX.get(month_str.lower())
+    if month is None:
+        return None
+
+    try:
+        return date(int(year_str) if year_str else default_year, month, int(day_str))
+    except ValueError:
+        # Out-of-range day for the month, e.g. "31 June"
+        return None
+
+
+def _order_id(order_link):
+    """Return the orderID query parameter of an order details link, or None."""
+    if not order_link:
+        return None
+    return parse_qs(urlsplit(order_link).query).get('orderID', [None])[0]
+
+
+def parse_delivery_date(delivery_date_str, today=None):
     """
     Parses various date string formats from Amazon into start and end datetime tuples.
     Returns (start_datetime, end_datetime). end_datetime is None for single-day events.
     If time is found, returns datetime objects with time. Otherwise returns date objects.
+    Relative dates are resolved against today, which defaults to the current date.
     """
-    today = datetime.now().date()
-    lower_str = delivery_date_str.lower()
+    if today is None:
+        today = date.today()
+    return _parse_delivery_date(delivery_date_str, today)
+
 
+@functools.lru_cache(maxsize=512)
+def _parse_delivery_date(delivery_date_str, today):
+    """
+    Cached implementation of parse_delivery_date.
+
+    Keyed on both the raw string and today's date so that relative strings
+    like "Arriving tomorrow" are re-evaluated when the day changes.
+    """
     # --- Handle "Now expected by" ---
-    if "now expected by" in lower_str:
+    if NOW_EXPECTED_RE.search(delivery_date_str):
         # Isolate the date part of the string
-        date_part_str = lower_str.replace("now expected by", "").strip()
-        # Parse dates like "19 July" or "19 Jul"
-        for fmt in ('%d %B', '%d %b'):
-            try:
-                dt = datetime.strptime(date_part_str, fmt)
-                # Assume current year if not specified
-                target_date = dt.replace(year=today.year).date()
-                return (target_date, None)
-            except ValueError:
-                continue
+        date_part_str = NOW_EXPECTED_RE.sub('', delivery_date_str).strip()
+        # Parse dates like "19 July" or "19 Jul", assuming the current year
+        target_date = _parse_day_month(date_part_str, today.year)
+        if target_date:
+            return (target_date, None)
 
     # Extract time range if present (e.g., "10am - 2pm", "10:30am-2:30pm")
-    time_pattern = r'(\d{1,2}(?::\d{2})?)\s*([ap]m)\s*[-–]\s*(\d{1,2}(?::\d{2})?)\s*([ap]m)'
-    time_match = re.search(time_pattern, lower_str)
+    time_match = TIME_RANGE_RE.search(delivery_date_str)
 
     start_time = None
     end_time = None
 
     if time_match:
-        start_time_str = time_match.group(1) + time_match.group(2)
-        end_time_str = time_match.group(3) + time_match.group(4)
-
-        try:
-            # Parse start time
-            if ':' in start_time_str:
-                start_time = datetime.strptime(start_time_str, '%I:%M%p').time()
-            else:
-                start_time = datetime.strptime(start_time_str, '%I%p').time()
-
-            # Parse end time
-            if ':' in end_time_str:
-                end_time = datetime.strptime(end_time_str, '%I:%M%p').time()
-            else:
-                end_time = datetime.strptime(end_time_str, '%I%p').time()
-        except ValueError:
+        start_time = _clock_time(*time_match.group(1, 2, 3))
+        end_time = _clock_time(*time_match.group(4, 5, 6))
+        if start_time is None or end_time is None:
             # If time parsing fails, fall back to no time
             start_time = None
             end_time = None
 
     # Remove time range from string for cleaner date parsing
-    clean_str = lower_str
+    clean_str = delivery_date_str
     if time_match:
-        clean_str = re.sub(time_pattern, '', clean_str).strip()
+        clean_str = TIME_RANGE_RE.sub('', clean_str).strip()
+
+    keywords = [keyword.lower() for keyword in KEYWORD_RE.findall(clean_str)]
 
     # --- Handle "today" ---
-    if "today" in clean_str:
+    if "today" in keywords:
         if start_time and end_time:
-            start_datetime = datetime.combine(today, start_time)
-            end_datetime = datetime.combine(today, end_time)
+            start_datetime = _combine(today, start_time)
+            end_datetime = _combine(today, end_time)
             return (start_datetime, end_datetime)
         return (today, None)
 
     # --- Handle "tomorrow" ---
-    if "tomorrow" in clean_str:
-        tomorrow = today + timedelta(days=1)
+    if "tomorrow" in keywords:
+        tomorrow = today + _ONE_DAY
         if start_time and end_time:
-            start_datetime = datetime.combine(tomorrow, start_time)
-            end_datetime = datetime.combine(tomorrow, end_time)
+            start_datetime = _combine(tomorrow, start_time)
+            end_datetime = _combine(tomorrow, end_time)
             return (start_datetime, end_datetime)
         return (tomorrow, None)
 
     # --- Handle weekdays e.g., "Arriving Sunday" ---
-    if "arriving" in clean_str:
-        weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        for i, day_name in enumerate(weekdays):
-            if day_name in clean_str:
-                days_ahead = (i - today.weekday() + 7) % 7
-                if days_ahead == 0:
-                    days_ahead = 7
-                target_date = today + timedelta(days=days_ahead)
-                if start_time and end_time:
-                    start_datetime = datetime.combine(target_date, start_time)
-                    end_datetime = datetime.combine(target_date, end_time)
-                    return (start_datetime, end_datetime)
-                return (target_date, None)
+    if "arriving" in keywords:
+        i = next((WEEKDAY_INDEX[k] for k in keywords if k in WEEKDAY_INDEX), None)
+        if i is not None:
+            days_ahead = (i - today.weekday() + 7) % 7
+            if days_ahead == 0:
+                days_ahead = 7
+            target_date = today + _DAYS_AHEAD[days_ahead]
+            if start_time and end_time:
+                start_datetime = _combine(target_date, start_time)
+                end_datetime = _combine(target_date, end_time)
+                return (start_datetime, end_datetime)
+            return (target_date, None)
 
     # --- Handle Date Ranges e.g., "16 July - 19 July" ---
     if '-' in clean_str and not time_match:
-        clean_range_str = clean_str.replace("arriving ", "").strip()
+        clean_range_str = STATUS_PREFIX_RE.sub('', clean_str).strip()
         parts = [p.strip() for p in clean_range_str.split('-')]
-        try:
-            start_date_str = parts[0]
-            end_date_str = parts[1]
-
-            # Parse start date (e.g., '16 July')
-            try:
-                start_date = datetime.strptime(start_date_str, '%d %B').replace(year=today.year).date()
-            except ValueError:
-                start_date = datetime.strptime(start_date_str, '%d %b').replace(year=today.year).date()
+        if len(parts) < 2:
+            print(f"Could not parse range '{delivery_date_str}'")
+            return (None, None)
 
-            # Parse end date (e.g., '19 July')
-            try:
-                end_date = datetime.strptime(end_date_str, '%d %B %Y').date()
-            except ValueError:
-                try:
-                    end_date = datetime.strptime(end_date_str, '%d %b %Y').date()
-                except ValueError:
-                    try:
-                        end_date = datetime.strptime(end_date_str, '%d %B').replace(year=start_date.year).date()
-                    except ValueError:
-                        end_date = datetime.strptime(end_date_str, '%d %b').replace(year=start_date.year).date()
-
-            # For ICS, the end date is exclusive, so add one day
-            return (start_date, end_date + timedelta(days=1))
-        except (ValueError, IndexError) as e:
-            print(f"Could not parse range '{delivery_date_str}': {e}")
+        # Start date has no year (e.g., '16 July'); end date may carry one
+        start_date = _parse_day_month(parts[0], today.year)
+        end_date = _parse_day_month(parts[1], start_date.year) if start_date else None
+        if not end_date:
+            print(f"Could not parse range '{delivery_date_str}'")
             return (None, None)
 
+        # For ICS, the end date is exclusive, so add one day
+        return (start_date, end_date + _ONE_DAY)
+
     # --- Handle Specific Dates e.g., "Delivered 9 July" or "14 July 2025" ---
-    clean_date_str = clean_str.replace("delivered ", "").replace("arriving ", "").strip()
-    for fmt in ('%d %B %Y', '%d %b %Y', '%d %B', '%d %b'):
-        try:
-            dt = datetime.strptime(clean_date_str, fmt)
-            if dt.year == 1900:
-                dt = dt.replace(year=today.year)
-            target_date = dt.date()
-            if start_time and end_time:
-                start_datetime = datetime.combine(target_date, start_time)
-                end_datetime = datetime.combine(target_date, end_time)
-                return (start_datetime, end_datetime)
-            return (target_date, None)
-        except ValueError:
-            continue
+    clean_date_str = STATUS_PREFIX_RE.sub('', clean_str).strip()
+    target_date = _parse_day_month(clean_date_str, today.year)
+    if target_date:
+        if start_time and end_time:
+            start_datetime = _combine(target_date, start_time)
+            end_datetime = _combine(target_date, end_time)
+            return (start_datetime, end_datetime)
+        return (target_date, None)
 
     return (None, None)
 
 
+ORDERS_URL = "https://www.amazon.in/your-orders/orders"
+
+# The card's first block mentioning its delivery status, and the bold status
+# text (e.g. "Arriving tomorrow") within it. They are matched one after the
+# other: only the first status block counts, even if it has no bold text.
+DELIVERY_STATUS_CONTAINER_SELECTOR = ':scope :is(div, span):-soup-contains("Arriving", "Delivered", "expected")'
+DELIVERY_STATUS_TEXT_SELECTOR = 'span.a-text-bold'
+
+# Only build the order cards themselves when parsing the scraped HTML
+ORDER_CARD_STRAINER = SoupStrainer('div', class_='a-box-group a-spacing-base')
+
+# Reusable wait condition for the order cards after changing page
+ORDER_CARDS_PRESENT = EC.presence_of_element_located((By.CLASS_NAME, "a-box-group"))
+
+
 class AmazonScraper(Scraper):
     """
     Amazon-specific scraper implementation.
     """
     
-    def __init__(self, email: str, password: str, totp_secret: Optional[str] = None, output_dir: str = "output", max_pages: int = 3):
+    persist_profile = True
+    
+    def __init__(self, email: str, password: str, totp_secret: Optional[str] = None, output_dir: str = "output", max_pages: int = 3,
+                 driver: Optional[webdriver.Chrome] = None, state_dir: str = "state"):
         """
         Initialize Amazon scraper with credentials and optional TOTP secret.
         
@@ -172,14 +253,32 @@ class AmazonScraper(Scraper):
             totp_secret: Optional TOTP secret for 2FA
             output_dir: Directory to save output files
             max_pages: Maximum number of order pages to scrape
+            driver: Optional shared WebDriver to use instead of launching one
+            state_dir: Private directory for saved cookies and the Chrome profile
         """
-        super().__init__(email, password, output_dir)
+        super().__init__(email, password, output_dir, driver, state_dir)
         self.totp_secret = totp_secret
+        self.totp = pyotp.TOTP(totp_secret) if totp_secret else None
         self.max_pages = max_pages
     
     def login(self) -> bool:
         """Login to Amazon website."""
         try:
+            # The persisted profile usually still holds a valid session, in
+            # which case the orders page loads without a sign-in redirect
+            self.driver.get(ORDERS_URL)
+            if "Your Orders" in self.driver.title:
+                self.logger.info("Reusing existing Amazon session.")
+                return True
+
+            # Otherwise try cookies saved by an earlier run; the sign-in
+            # redirect leaves the browser on amazon.in so they can be added
+            if self.load_cookies():
+                self.driver.get(ORDERS_URL)
+                if "Your Orders" in self.driver.title:
+                    self.logger.info("Restored Amazon session from saved cookies.")
+                    return True
+
             url = "https://www.amazon.in/ap/signin?openid.pape.max_auth_age=0&openid.return_to=https%3A%2F%2Fwww.amazon.in%2Fyour-orders%2Forders%3Fref_%3Dnav_orders_first&openid.identity=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.assoc_handle=amzn_retail_yourorders_in&openid.mode=checkid_setup&language=en_IN&openid.claimed_id=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0%2Fidentifier_select&openid.ns=http%3A%2F%2Fspecs.openid.net%2Fauth%2F2.0"
             self.driver.get(url)
 
@@ -193,26 +292,35 @@ class AmazonScraper(Scraper):
             password_field.send_keys(self.password)
             self.driver.find_element(By.ID, "signInSubmit").click()
 
-            # Handle 2FA/OTP if required
+            # Either the OTP prompt or the orders page comes next; wait for
+            # whichever appears first rather than timing out on the OTP field
             try:
-                otp_field = self.wait.until(EC.presence_of_element_located((By.ID, "auth-mfa-otpcode")))
+                landing = self.wait.until(EC.any_of(
+                    EC.presence_of_element_located((By.ID, "auth-mfa-otpcode")),
+                    EC.title_contains("Your Orders")
+                ))
+            except TimeoutException:
+                landing = None
+
+            # Handle 2FA/OTP if required
+            if landing is not None and landing is not True:
+                otp_field = landing
                 self.logger.info("2FA required. Generating OTP...")
                 
-                if not self.totp_secret:
+                if not self.totp:
                     raise ValueError("Amazon is asking for 2FA, but no TOTP_SECRET was provided.")
 
-                totp = pyotp.TOTP(self.totp_secret)
-                otp_code = totp.now()
+                otp_code = self.totp.now()
                 
                 otp_field.send_keys(otp_code)
                 self.logger.info("Submitting OTP...")
                 self.driver.find_element(By.ID, "auth-signin-button").click()
-
-            except TimeoutException:
+            else:
                 self.logger.info("2FA not required for this session.")
 
             self.wait.until(EC.title_contains("Your Orders"))
             self.logger.info("Successfully logged into Amazon.")
+            self.save_cookies()
             return True
             
         except Exception as e:
@@ -222,24 +330,23 @@ class AmazonScraper(Scraper):
     def scrape_orders(self) -> List[Dict[str, Any]]:
         """Scrape orders from Amazon."""
         orders = []
+        # Resolve relative dates against one date for the whole scrape
+        today = date.today()
+        # Orders can be repeated across page boundaries
+        seen_order_ids = set()
         
         try:
             # Loop through multiple pages
             for page_num in range(1, self.max_pages + 1):
                 self.logger.info(f"Scraping page {page_num}/{self.max_pages}...")
                 
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                order_cards = soup.find_all('div', class_='a-box-group a-spacing-base')
+                cards_html = self.driver.execute_script(ORDER_CARDS_SCRIPT)
+                soup = BeautifulSoup(cards_html or '', 'lxml', parse_only=ORDER_CARD_STRAINER)
+                order_cards = soup.find_all('div', class_='a-box-group a-spacing-base', recursive=False)
                 self.logger.info(f"Found {len(order_cards)} order cards on page {page_num}.")
 
                 for card in order_cards:
-                    # Find delivery status container
-                    delivery_status_container = card.find(lambda tag: (tag.name == 'div' or tag.name == 'span') and ("Arriving" in tag.text or "Delivered" in tag.text or "expected" in tag.text))
-
-                    if delivery_status_container:
-                        delivery_date_element = delivery_status_container.find('span', class_='a-text-bold')
-                    else:
-                        delivery_date_element = None
+                    delivery_date_element = self._find_delivery_status(card)
 
                     if delivery_date_element:
                         delivery_date_str = delivery_date_element.text.strip()
@@ -248,28 +355,19 @@ class AmazonScraper(Scraper):
                             self.logger.info(f"⏩ Skipping delivered order (Status: {delivery_date_str})")
                             continue
 
-                        start_date, end_date = parse_delivery_date(delivery_date_str)
+                        start_date, end_date = parse_delivery_date(delivery_date_str, today)
 
                         if start_date:
-                            # Find the order details link
-                            order_link = None
-                            order_link_element = card.find('a', href=lambda href: href and 'order-details' in href)
-                            if not order_link_element:
-                                order_link_element = card.find('a', string=lambda text: text and 'order details' in text.lower())
-                            if not order_link_element:
-                                order_link_element = card.find('a', href=lambda href: href and 'gp/your-account/order-details' in href)
-                                
-                            if order_link_element and order_link_element.get('href'):
-                                order_link = order_link_element['href']
-                                if order_link.startswith('/'):
-                                    order_link = 'https://www.amazon.in' + order_link
-
-                            # Find product elements
-                            product_elements = card.find_all('div', class_='yohtmlc-product-title')
-                            
-                            if not product_elements:
-                                product_elements = card.find_all('a', class_='a-link-normal')
-                                product_elements = [elem for elem in product_elements if elem.text.strip() and len(elem.text.strip()) > 5]
+                            details = self._extract_card_details(card)
+                            order_link = details['order_link']
+                            product_elements = details['product_elements']
+
+                            order_id = _order_id(order_link)
+                            if order_id:
+                                if order_id in seen_order_ids:
+                                    self.logger.info(f"⏩ Skipping repeated order {order_id}")
+                                    continue
+                                seen_order_ids.add(order_id)
 
                             if not product_elements:
                                 # Fallback: create one order for the entire card
@@ -283,7 +381,7 @@ class AmazonScraper(Scraper):
                                 self.logger.info(f"✅ Added order: Unknown Product on {start_date}")
                             else:
                                 # Create separate orders for each product
-                                for product_element in product_elements:
+                                for item_index, product_element in enumerate(product_elements):
                                     product_name = product_element.text.strip()
                                     if product_name:
                                         orders.append({
@@ -291,6 +389,7 @@ class AmazonScraper(Scraper):
                                             'start_date': start_date,
                                             'end_date': end_date,
                                             'order_link': order_link,
+                                            'item_index': item_index,
                                             'status': delivery_date_str
                                         })
                                         self.logger.info(f"✅ Added order: {product_name} on {start_date}")
@@ -309,9 +408,7 @@ class AmazonScraper(Scraper):
                         self.logger.info("Navigating to the next page...")
                         next_button.click()
                         
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.CLASS_NAME, "a-box-group"))
-                        )
+                        self.wait.until(ORDER_CARDS_PRESENT)
 
                     except Exception as e:
                         self.logger.info(f"No more pages found or 'Next' button is not clickable: {e}")
@@ -322,13 +419,61 @@ class AmazonScraper(Scraper):
             
         return orders
     
-    def parse_delivery_date(self, date_text: str) -> Optional[str]:
+    def _find_delivery_status(self, card):
+        """Return the bold delivery status element of an order card, or None."""
+        container = card.select_one(DELIVERY_STATUS_CONTAINER_SELECTOR)
+        if container is None:
+            return None
+        return container.select_one(DELIVERY_STATUS_TEXT_SELECTOR)
+    
+    def _extract_card_details(self, card) -> Dict[str, Any]:
+        """
+        Collect the order details link and product elements of an order card.
+
+        Anchors and product title blocks are classified in a single pass over
+        the card instead of walking the subtree once per selector.
+        """
+        link_by_href = None
+        link_by_text = None
+        product_links = []
+        product_titles = []
+
+        for element in card.find_all(['a', 'div']):
+            if element.name == 'div':
+                if 'yohtmlc-product-title' in element.get('class', []):
+                    product_titles.append(element)
+                continue
+
+            anchor = element
+            href = anchor.get('href') or ''
+            text = anchor.text.strip()
+
+            if link_by_href is None and 'order-details' in href:
+                link_by_href = anchor
+            if link_by_text is None and 'order details' in text.lower():
+                link_by_text = anchor
+            if 'a-link-normal' in anchor.get('class', []) and len(text) > 5:
+                product_links.append(anchor)
+
+        order_link = None
+        order_link_element = link_by_href or link_by_text
+        if order_link_element and order_link_element.get('href'):
+            order_link = order_link_element['href']
+            if order_link.startswith('/'):
+                order_link = 'https://www.amazon.in' + order_link
+
+        # Prefer dedicated product title blocks over generic links
+        product_elements = product_titles or product_links
+
+        return {'order_link': order_link, 'product_elements': product_elements}
+    
+    def parse_delivery_date(self, date_text: str, today: Optional[date] = None) -> Optional[str]:
         """Parse Amazon delivery date format."""
-        start_date, end_date = parse_delivery_date(date_text)
-        if start_date:
-            if isinstance(start_date, datetime):
-                return start_date.strftime('%Y-%m-%d')
-            elif isinstance(start_date, date):
-                return start_date.strftime('%Y-%m-%d')
-        return None
+        start_date, end_date = parse_delivery_date(date_text, today)
+        if not start_date:
+            return None
+        # Delivery windows come back as datetimes; only the day is wanted
+        if type(start_date) is datetime:
+            start_date = start_date.date()
+        return start_date.isoformat()
     
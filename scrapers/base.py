@@ -4,7 +4,9 @@ Base scraper class that defines the common interface for all retailer scrapers.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
+from datetime import date
 import os
+import json
 import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -13,6 +15,46 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
+# Configure logging once on import, unless the application already did
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+
+
+def create_driver(profile_dir: Optional[str] = None) -> webdriver.Chrome:
+    """
+    Create a headless Chrome WebDriver with the options shared by all scrapers.
+    
+    Args:
+        profile_dir: Optional Chrome user-data directory to persist the session in
+        
+    Returns:
+        Configured Chrome WebDriver instance
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+    # Scrapers only read text, so skip images and extensions and hand
+    # control back once the DOM is ready instead of waiting for every asset
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    chrome_options.page_load_strategy = "eager"
+
+    if profile_dir:
+        os.makedirs(profile_dir, mode=0o700, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+
+    return webdriver.Chrome(options=chrome_options)
+
+
 class Scraper(ABC):
     """
     Abstract base class for all retailer scrapers.
@@ -22,7 +64,12 @@ class Scraper(ABC):
     retailer-specific scraping logic.
     """
     
-    def __init__(self, email: str, password: str, output_dir: str = "output"):
+    # Subclasses that can resume a logged-in session set this to keep their
+    # Chrome profile (cookies, local storage) on disk between runs
+    persist_profile: bool = False
+    
+    def __init__(self, email: str, password: str, output_dir: str = "output",
+                 driver: Optional[webdriver.Chrome] = None, state_dir: str = "state"):
         """
         Initialize the scraper with credentials and output directory.
         
@@ -30,45 +77,91 @@ class Scraper(ABC):
             email: Login email for the retailer
             password: Login password for the retailer
             output_dir: Directory to save output files
+            driver: Optional shared WebDriver; the caller stays responsible for quitting it
+            state_dir: Private directory for session data such as saved cookies and
+                the Chrome profile; keep it apart from output_dir, which may be served publicly
         """
         self.email = email
         self.password = password
         self.output_dir = output_dir
-        self.driver: Optional[webdriver.Chrome] = None
+        self.state_dir = state_dir
+        self.profile_dir = os.path.join(state_dir, "chrome-profile", self.__class__.__name__.lower())
+        self.cookies_file = os.path.join(state_dir, f"{self.__class__.__name__.lower()}_cookies.json")
+        self.driver: Optional[webdriver.Chrome] = driver
+        self.owns_driver = driver is None
         self.wait: Optional[WebDriverWait] = None
         
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def setup_driver(self) -> webdriver.Chrome:
         """
-        Setup and configure the Chrome WebDriver with appropriate options.
+        Setup the Chrome WebDriver, reusing a shared driver if one was given.
+        
+        A shared driver already has its own profile, so persist_profile only
+        applies to drivers the scraper creates itself.
         
         Returns:
             Configured Chrome WebDriver instance
         """
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
+        if self.driver is None:
+            profile_dir = None
+            if self.persist_profile:
+                # The profile holds the logged-in cookie database
+                os.makedirs(self.state_dir, mode=0o700, exist_ok=True)
+                profile_dir = self.profile_dir
+            self.driver = create_driver(profile_dir)
         self.wait = WebDriverWait(self.driver, 10)
         return self.driver
     
     def cleanup(self):
-        """Clean up resources, particularly the WebDriver."""
-        if self.driver:
+        """Clean up resources, quitting the WebDriver if this scraper created it."""
+        if self.driver and self.owns_driver:
             self.driver.quit()
             self.driver = None
-            self.wait = None
+        self.wait = None
+    
+    def save_cookies(self):
+        """Store the current browser cookies so a later run can skip login."""
+        try:
+            os.makedirs(self.state_dir, mode=0o700, exist_ok=True)
+            # Cookies are live session credentials, so only the owner may read them
+            fd = os.open(self.cookies_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.driver.get_cookies(), f)
+        except Exception as e:
+            self.logger.warning(f"Failed to save cookies: {str(e)}")
+    
+    def load_cookies(self) -> bool:
+        """
+        Add previously saved cookies to the browser.
+        
+        The browser must already be on the retailer's domain.
+        
+        Returns:
+            True if any cookies were loaded, False otherwise
+        """
+        if not os.path.exists(self.cookies_file):
+            return False
+        
+        try:
+            with open(self.cookies_file) as f:
+                cookies = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to read saved cookies: {str(e)}")
+            return False
+        
+        loaded = 0
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+                loaded += 1
+            except Exception:
+                continue
+        return loaded > 0
     
     @abstractmethod
     def login(self) -> bool:
@@ -91,12 +184,14 @@ class Scraper(ABC):
         pass
     
     @abstractmethod
-    def parse_delivery_date(self, date_text: str) -> Optional[str]:
+    def parse_delivery_date(self, date_text: str, today: Optional[date] = None) -> Optional[str]:
         """
         Parse delivery date from retailer-specific text format.
         
         Args:
             date_text: Raw date text from the website
+            today: Date to resolve relative dates against; defaults to the current
+                date. Pass one value when parsing a batch of orders.
             
         Returns:
             Standardized date string in YYYY-MM-DD format, or None if parsing fails
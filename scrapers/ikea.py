@@ -3,25 +3,219 @@ IKEA scraper implementation for IKEA India.
 """
 
 import re
-import time
+import functools
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 from typing import List, Dict, Any, Optional
 
 from .base import Scraper
 
 
+_ONE_DAY = timedelta(days=1)
+# Offsets for "next <weekday>", which is always 1 to 7 days ahead
+_DAYS_AHEAD = tuple(timedelta(days=i) for i in range(8))
+
+# Possible order containers on the purchases page, most specific first
+ORDER_SELECTORS = [
+    '.order-card',
+    '.purchase-item',
+    '.order-item',
+    '[data-testid*="order"]',
+    '.order',
+    '.purchase',
+    'article',
+    '.card'
+]
+ORDER_SELECTORS_COMBINED = ', '.join(ORDER_SELECTORS)
+# Generic containers such as 'article' and '.card' can render before the
+# orders do, so only the order-specific ones signal that the list is ready
+ORDER_READY_LOCATORS = [(By.CSS_SELECTOR, selector) for selector in ORDER_SELECTORS[:6]]
+# None of these selectors are confirmed against the live page, and when none
+# match the fallback scan runs anyway, so don't wait long for them
+ORDER_READY_TIMEOUT = 3
+
+# Text suggesting a container holds an order, for pages where no order
+# selector matches
+FALLBACK_KEYWORDS_RE = re.compile(r'order|purchase|delivery|shipped|delivered', re.IGNORECASE)
+FALLBACK_CONTAINERS = ['div', 'article', 'section']
+
+# Words marking link text and text lines that are not product titles
+SKIP_TITLE_WORDS = ('order', 'details', 'view', 'track', 'more')
+SKIP_LINE_WORDS = ('order', 'purchase', 'delivery', 'status')
+
+# Order numbers such as "Order #123456" or "Order: 123456", most specific first
+ORDER_ID_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'order\s*number\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
+    r'order\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
+    r'purchase\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
+    r'#([a-zA-Z0-9]{6,})',
+    r'([0-9]{8,})',
+)]
+
+# Delivery status phrases, most specific first
+DELIVERY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(expected delivery[^.]*)',
+    r'(estimated delivery[^.]*)',
+    r'(expected arrival[^.]*)',
+    r'(estimated arrival[^.]*)',
+    r'(delivery(?!\s+info)(?!\s+details)[^.]*)',
+    r'(arriving[^.]*)',
+    r'(shipped[^.]*)',
+    r'(delivered[^.]*)',
+    r'(expected[^.]*)',
+    r'(estimated[^.]*)',
+)]
+
+# Every delivery phrase above contains one of these words, so a single scan
+# for them rules out text that none of the patterns can match
+DELIVERY_KEYWORDS_RE = re.compile(r'delivery|arriving|shipped|delivered|expected|estimated', re.IGNORECASE)
+
+# Bare dates to fall back on when no delivery phrase is present
+DELIVERY_DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+    r'(\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{2,4})',
+    r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{2,4})',
+)]
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+WEEKDAY_INDEX = {name: i for i, name in enumerate(WEEKDAYS)}
+WEEKDAY_RE = re.compile(r'\b(' + '|'.join(WEEKDAYS) + r')\b')
+
+# Cheap check for text that could hold any date parse_delivery_date knows
+DATE_HINT_RE = re.compile(r'\d|today|tomorrow|' + '|'.join(WEEKDAYS))
+
+DIGIT_RE = re.compile(r'\d')
+
+# Relative deliveries like "in 3 days" or "within 5 days"
+RELATIVE_DAYS_RE = re.compile(r'(?:in|within)\s+(\d+)\s+days?')
+
+
+# Century to add to each two-digit year, indexed by the year itself
+_SHORT_YEAR_CENTURY = tuple(2000 if year < 50 else 1900 for year in range(100))
+
+# Month abbreviations as captured by the patterns below
+MONTH_INDEX = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+
+def _day_month_year(match, today):
+    """Build a date from "DD Month YYYY" groups."""
+    return date(int(match.group(3)), MONTH_INDEX[match.group(2)], int(match.group(1)))
+
+
+def _month_day_year(match, today):
+    """Build a date from "Month DD, YYYY" groups."""
+    return date(int(match.group(3)), MONTH_INDEX[match.group(1)], int(match.group(2)))
+
+
+def _numeric_day_month_year(match, today):
+    """Build a date from DD/MM/YYYY groups."""
+    return date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+
+
+def _numeric_day_month_short_year(match, today):
+    """Build a date from DD/MM/YY groups, reading 00-49 as 20xx and 50-99 as 19xx."""
+    year = int(match.group(3))
+    return date(year + _SHORT_YEAR_CENTURY[year], int(match.group(2)), int(match.group(1)))
+
+
+def _day_month(match, today):
+    """Build a date from "DD Month" groups, assuming the current year."""
+    return date(today.year, MONTH_INDEX[match.group(2)], int(match.group(1)))
+
+
+# Specific date formats matched against lowercased text, each with the
+# function that builds a date from its groups (raising ValueError for
+# impossible dates such as 31/02/2025); explicit years come first
+DATE_FORMAT_PATTERNS = [(re.compile(pattern), build) for pattern, build in (
+    # DD Month YYYY format (with explicit year)
+    (r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{4})', _day_month_year),
+    # Month DD, YYYY format (with explicit year)
+    (r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2}),?\s+(\d{4})', _month_day_year),
+    # DD/MM/YYYY, DD-MM-YYYY
+    (r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})', _numeric_day_month_year),
+    # DD/MM/YY, DD-MM-YY
+    (r'(\d{1,2})[-/](\d{1,2})[-/](\d{2})', _numeric_day_month_short_year),
+    # DD Month (current year) - only after explicit year patterns
+    (r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*(?!\s+\d{4})', _day_month),
+)]
+
+
+def _find_fallback_containers(soup):
+    """Return every div, article or section whose text mentions an order keyword."""
+    # Match on each container's full text rather than on single text nodes,
+    # so keywords split across tags (e.g. "<b>Deliv</b>ery") still count
+    return [
+        elem for elem in soup.find_all(FALLBACK_CONTAINERS)
+        if FALLBACK_KEYWORDS_RE.search(elem.get_text())
+    ]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_delivery_date(lower_text, today):
+    """
+    Resolve lowercased, undelivered delivery text to a date, or None.
+
+    Cached on both the text and today's date, since status strings repeat
+    across orders and relative dates change when the day does.
+    """
+    # Handle "today"
+    if "today" in lower_text:
+        return today
+    
+    # Handle "tomorrow"
+    if "tomorrow" in lower_text:
+        tomorrow = today + _ONE_DAY
+        return tomorrow
+    
+    # Relative days and every specific date format need a digit, so text
+    # without one only has the weekday check left to try
+    has_digit = DIGIT_RE.search(lower_text) is not None
+    
+    # Handle relative days like "in 3 days", "within 5 days"
+    days_match = has_digit and RELATIVE_DAYS_RE.search(lower_text)
+    if days_match:
+        days = int(days_match.group(1))
+        target_date = today + timedelta(days=days)
+        return target_date
+    
+    # Handle weekdays
+    weekday_match = WEEKDAY_RE.search(lower_text)
+    if weekday_match:
+        i = WEEKDAY_INDEX[weekday_match.group(1)]
+        days_ahead = (i - today.weekday() + 7) % 7
+        if days_ahead == 0:
+            days_ahead = 7
+        target_date = today + _DAYS_AHEAD[days_ahead]
+        return target_date
+    
+    if not has_digit:
+        return None
+    
+    # Handle specific date formats - prioritize patterns with explicit years
+    for pattern, build in DATE_FORMAT_PATTERNS:
+        match = pattern.search(lower_text)
+        if match:
+            try:
+                return build(match, today)
+            except ValueError:
+                continue
+    return None
+
+
 class IkeaScraper(Scraper):
     """
     IKEA India-specific scraper implementation.
     """
     
-    def __init__(self, email: str, password: str, output_dir: str = "output"):
+    def __init__(self, email: str, password: str, output_dir: str = "output",
+                 driver: Optional[webdriver.Chrome] = None, state_dir: str = "state"):
         """
         Initialize IKEA scraper with credentials.
         
@@ -29,8 +223,10 @@ class IkeaScraper(Scraper):
             email: IKEA login email
             password: IKEA login password
             output_dir: Directory to save output files
+            driver: Optional shared WebDriver to use instead of launching one
+            state_dir: Private directory for saved cookies and the Chrome profile
         """
-        super().__init__(email, password, output_dir)
+        super().__init__(email, password, output_dir, driver, state_dir)
     
     def login(self) -> bool:
         """Login to IKEA India website."""
@@ -42,40 +238,20 @@ class IkeaScraper(Scraper):
             self.logger.info("Navigating to IKEA India login page...")
             
             # Wait for and click the login button to open the login form
-            login_button = None
-            login_selectors = [
-                "[data-testid='login-button']",
-                "button[data-testid='login-button']",
-                ".login-button",
-                "button.login-button",
-                "a[href*='login']",
-                "button[type='button']:contains('Log in')",
-                "button:contains('Sign in')",
-                "button:contains('Login')",
-                ".btn-login",
-                "#login-btn",
-                "[aria-label*='login']",
-                "[aria-label*='sign in']",
-                "button[class*='login']",
-                "a[class*='login']"
-            ]
-            
-            for selector in login_selectors:
-                try:
-                    if "contains" in selector:
-                        # Handle XPath-style selectors
-                        xpath_selector = f"//button[contains(text(), 'Log in')] | //button[contains(text(), 'Sign in')] | //button[contains(text(), 'Login')]"
-                        login_button = self.wait.until(
-                            EC.element_to_be_clickable((By.XPATH, xpath_selector))
-                        )
-                    else:
-                        login_button = self.wait.until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    self.logger.info(f"Found login button using selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            login_button = self._wait_for_first(EC.element_to_be_clickable, [
+                (By.CSS_SELECTOR, "[data-testid='login-button']"),
+                (By.CSS_SELECTOR, "button[data-testid='login-button']"),
+                (By.CSS_SELECTOR, ".login-button"),
+                (By.CSS_SELECTOR, "button.login-button"),
+                (By.CSS_SELECTOR, "a[href*='login']"),
+                (By.XPATH, "//button[contains(text(), 'Log in')] | //button[contains(text(), 'Sign in')] | //button[contains(text(), 'Login')]"),
+                (By.CSS_SELECTOR, ".btn-login"),
+                (By.CSS_SELECTOR, "#login-btn"),
+                (By.CSS_SELECTOR, "[aria-label*='login']"),
+                (By.CSS_SELECTOR, "[aria-label*='sign in']"),
+                (By.CSS_SELECTOR, "button[class*='login']"),
+                (By.CSS_SELECTOR, "a[class*='login']"),
+            ])
             
             if not login_button:
                 self.logger.error("Could not find login button with any selector")
@@ -86,29 +262,18 @@ class IkeaScraper(Scraper):
             self.logger.info("Clicked login button...")
             
             # Wait for email field and enter email
-            email_field = None
-            email_selectors = [
-                "input[type='email']",
-                "input[name='email']",
-                "#email",
-                "#Email",
-                "input[placeholder*='email']",
-                "input[placeholder*='Email']",
-                "input[id*='email']",
-                "input[class*='email']",
-                "[data-testid='email']",
-                "[data-testid='email-input']"
-            ]
-            
-            for selector in email_selectors:
-                try:
-                    email_field = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    self.logger.info(f"Found email field using selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            email_field = self._wait_for_first(EC.presence_of_element_located, [
+                (By.CSS_SELECTOR, "input[type='email']"),
+                (By.CSS_SELECTOR, "input[name='email']"),
+                (By.CSS_SELECTOR, "#email"),
+                (By.CSS_SELECTOR, "#Email"),
+                (By.CSS_SELECTOR, "input[placeholder*='email']"),
+                (By.CSS_SELECTOR, "input[placeholder*='Email']"),
+                (By.CSS_SELECTOR, "input[id*='email']"),
+                (By.CSS_SELECTOR, "input[class*='email']"),
+                (By.CSS_SELECTOR, "[data-testid='email']"),
+                (By.CSS_SELECTOR, "[data-testid='email-input']"),
+            ])
             
             if not email_field:
                 self.logger.error("Could not find email field with any selector")
@@ -120,29 +285,18 @@ class IkeaScraper(Scraper):
             self.logger.info("Entered email...")
             
             # Wait for password field and enter password
-            password_field = None
-            password_selectors = [
-                "input[type='password']",
-                "input[name='password']",
-                "#password",
-                "#Password",
-                "input[placeholder*='password']",
-                "input[placeholder*='Password']",
-                "input[id*='password']",
-                "input[class*='password']",
-                "[data-testid='password']",
-                "[data-testid='password-input']"
-            ]
-            
-            for selector in password_selectors:
-                try:
-                    password_field = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    self.logger.info(f"Found password field using selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            password_field = self._wait_for_first(EC.presence_of_element_located, [
+                (By.CSS_SELECTOR, "input[type='password']"),
+                (By.CSS_SELECTOR, "input[name='password']"),
+                (By.CSS_SELECTOR, "#password"),
+                (By.CSS_SELECTOR, "#Password"),
+                (By.CSS_SELECTOR, "input[placeholder*='password']"),
+                (By.CSS_SELECTOR, "input[placeholder*='Password']"),
+                (By.CSS_SELECTOR, "input[id*='password']"),
+                (By.CSS_SELECTOR, "input[class*='password']"),
+                (By.CSS_SELECTOR, "[data-testid='password']"),
+                (By.CSS_SELECTOR, "[data-testid='password-input']"),
+            ])
             
             if not password_field:
                 self.logger.error("Could not find password field with any selector")
@@ -154,38 +308,18 @@ class IkeaScraper(Scraper):
             self.logger.info("Entered password...")
             
             # Submit the login form
-            submit_button = None
-            submit_selectors = [
-                "button[type='submit']",
-                "input[type='submit']",
-                "[data-testid='login-submit']",
-                "[data-testid='submit']",
-                "button[class*='submit']",
-                "button[id*='submit']",
-                ".btn-submit",
-                "#submit-btn",
-                "button:contains('Submit')",
-                "button:contains('Sign in')",
-                "button:contains('Log in')",
-                "form button[type='button']"
-            ]
-            
-            for selector in submit_selectors:
-                try:
-                    if "contains" in selector:
-                        # Handle XPath-style selectors
-                        xpath_selector = f"//button[contains(text(), 'Submit')] | //button[contains(text(), 'Sign in')] | //button[contains(text(), 'Log in')]"
-                        submit_button = self.wait.until(
-                            EC.element_to_be_clickable((By.XPATH, xpath_selector))
-                        )
-                    else:
-                        submit_button = self.wait.until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    self.logger.info(f"Found submit button using selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            submit_button = self._wait_for_first(EC.element_to_be_clickable, [
+                (By.CSS_SELECTOR, "button[type='submit']"),
+                (By.CSS_SELECTOR, "input[type='submit']"),
+                (By.CSS_SELECTOR, "[data-testid='login-submit']"),
+                (By.CSS_SELECTOR, "[data-testid='submit']"),
+                (By.CSS_SELECTOR, "button[class*='submit']"),
+                (By.CSS_SELECTOR, "button[id*='submit']"),
+                (By.CSS_SELECTOR, ".btn-submit"),
+                (By.CSS_SELECTOR, "#submit-btn"),
+                (By.XPATH, "//button[contains(text(), 'Submit')] | //button[contains(text(), 'Sign in')] | //button[contains(text(), 'Log in')]"),
+                (By.CSS_SELECTOR, "form button[type='button']"),
+            ])
             
             if submit_button:
                 submit_button.click()
@@ -225,6 +359,28 @@ class IkeaScraper(Scraper):
             self._save_error_screenshot("login_exception")
             return False
     
+    def _wait_for_first(self, condition, locators, timeout: Optional[float] = None):
+        """
+        Wait for the first of several fallback locators to satisfy a condition.
+        
+        All locators are polled together under a single timeout, and earlier
+        locators win when more than one matches.
+        
+        Args:
+            condition: Expected condition factory taking a locator, e.g.
+                EC.presence_of_element_located
+            locators: (By, selector) pairs in order of preference
+            timeout: Seconds to wait, defaulting to the scraper's usual wait
+            
+        Returns:
+            The matched element, or None if nothing matched before the timeout
+        """
+        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        try:
+            return wait.until(EC.any_of(*(condition(locator) for locator in locators)))
+        except TimeoutException:
+            return None
+    
     def _save_error_screenshot(self, error_type: str):
         """Save a screenshot for debugging login errors."""
         try:
@@ -245,27 +401,22 @@ class IkeaScraper(Scraper):
             self.driver.get(purchases_url)
             self.logger.info("Navigating to IKEA purchases page...")
             
-            # Wait for page to load
-            time.sleep(3)
+            # Wait briefly for the order list to render rather than for a fixed
+            # time; get() already returns once the DOM is ready, and with no
+            # orders this costs no more than the old 3s sleep
+            if not self._wait_for_first(EC.presence_of_element_located, ORDER_READY_LOCATORS,
+                                        timeout=ORDER_READY_TIMEOUT):
+                self.logger.info("No order container appeared, scanning the page as loaded")
             
             # Look for order containers with various possible selectors
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Try multiple selectors for order containers
-            order_selectors = [
-                '.order-card',
-                '.purchase-item',
-                '.order-item',
-                '[data-testid*="order"]',
-                '.order',
-                '.purchase',
-                'article',
-                '.card'
-            ]
+            soup = BeautifulSoup(self.driver.page_source, 'lxml')
             
+            # Find candidates for every selector in one pass over the page, then
+            # keep those of the most specific selector that matched anything
+            candidates = soup.select(ORDER_SELECTORS_COMBINED)
             order_elements = []
-            for selector in order_selectors:
-                elements = soup.select(selector)
+            for selector in ORDER_SELECTORS:
+                elements = [element for element in candidates if element.css.match(selector)]
                 if elements:
                     order_elements = elements
                     self.logger.info(f"Found {len(elements)} order elements using selector: {selector}")
@@ -273,18 +424,16 @@ class IkeaScraper(Scraper):
             
             if not order_elements:
                 # Fallback: look for any elements containing order-related text
-                all_elements = soup.find_all(['div', 'article', 'section'])
-                order_elements = [
-                    elem for elem in all_elements 
-                    if elem.get_text() and any(keyword in elem.get_text().lower() 
-                    for keyword in ['order', 'purchase', 'delivery', 'shipped', 'delivered'])
-                ]
+                order_elements = _find_fallback_containers(soup)
                 self.logger.info(f"Fallback: Found {len(order_elements)} potential order elements")
             
             if not order_elements:
                 self.logger.info("No orders found on the page")
                 return orders
             
+            # Resolve relative dates for the whole page against the same day
+            today = date.today()
+            
             for i, order_element in enumerate(order_elements):
                 try:
                     order_text = order_element.get_text()
@@ -310,12 +459,14 @@ class IkeaScraper(Scraper):
                     # Parse delivery date
                     delivery_date = None
                     if delivery_info:
-                        delivery_date = self.parse_delivery_date(delivery_info)
+                        delivery_date = self.parse_delivery_date(delivery_info, today)
                     
                     if delivery_date or delivery_info:
                         order = {
-                            'order_id': order_id or f"ikea-{i+1}",
-                            'title': f"🛋️ IKEA: {title}" if title else f"🛋️ IKEA: Order {order_id or i+1}",
+                            # No position-based fallbacks: they would change the
+                            # event UID whenever the order list is reordered
+                            'order_id': order_id,
+                            'title': f"🛋️ IKEA: {title}" if title else f"🛋️ IKEA: Order {order_id or ''}".rstrip(),
                             'start_date': delivery_date,
                             'status': delivery_info or "Unknown status"
                         }
@@ -335,19 +486,8 @@ class IkeaScraper(Scraper):
     
     def _extract_order_id(self, text: str) -> Optional[str]:
         """Extract order ID from order text."""
-        # Look for patterns like "Order #123456", "Order: 123456", etc.
-    
-        patterns = [
-            r'order\s*number\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
-            r'order\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
-            r'purchase\s*[#:]?\s*([a-zA-Z0-9]*\d+[a-zA-Z0-9]*)',
-            r'#([a-zA-Z0-9]{6,})',
-            r'([0-9]{8,})'
-        ]
-    
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in ORDER_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -357,20 +497,23 @@ class IkeaScraper(Scraper):
         """Extract product title from order element."""
         # Try to find product name in various ways
         
-        # Look for links that might contain product names
-        links = element.find_all('a')
-        for link in links:
-            link_text = link.get_text().strip()
-            if link_text and len(link_text) > 5 and not any(skip in link_text.lower() 
-                for skip in ['order', 'details', 'view', 'track', 'more']):
-                return link_text
+        # Look for links that might contain product names, then headings.
+        # Both come from one traversal; a heading is only used if no link fits.
+        heading_title = None
+        for tag in element.find_all(['a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            if tag.name == 'a':
+                link_text = tag.get_text().strip()
+                if len(link_text) > 5:
+                    lower_link = link_text.lower()
+                    if not any(skip in lower_link for skip in SKIP_TITLE_WORDS):
+                        return link_text
+            elif heading_title is None:
+                heading_text = tag.get_text().strip()
+                if heading_text and len(heading_text) > 5:
+                    heading_title = heading_text
         
-        # Look for headings
-        headings = element.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        for heading in headings:
-            heading_text = heading.get_text().strip()
-            if heading_text and len(heading_text) > 5:
-                return heading_text
+        if heading_title:
+            return heading_title
         
         # Look for elements with product-related classes
         product_selectors = ['.product-name', '.item-name', '.title', '.name']
@@ -382,136 +525,66 @@ class IkeaScraper(Scraper):
                     return product_text
         
         # Fallback: extract first meaningful line from text
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        for line in lines:
-            if (len(line) > 10 and len(line) < 100 and 
-                not any(skip in line.lower() for skip in ['order', 'purchase', 'delivery', 'status'])):
-                return line
+        # Stripped lazily, since the first suitable line ends the search
+        for line in (raw_line.strip() for raw_line in text.split('\n')):
+            if 10 < len(line) < 100:
+                lower_line = line.lower()
+                if not any(skip in lower_line for skip in SKIP_LINE_WORDS):
+                    return line
         
         return None
     
     def _extract_delivery_info(self, text: str) -> Optional[str]:
         """Extract delivery information from order text."""
-        # Look for delivery-related information - order from most specific to least specific
-        # Look for delivery-related information
-        delivery_patterns = [
-            r'(expected delivery[^.]*)',
-            r'(estimated delivery[^.]*)',
-            r'(expected arrival[^.]*)',
-            r'(estimated arrival[^.]*)',
-    
-            r'(delivery(?!\s+info)(?!\s+details)[^.]*)',
-        
-            r'(arriving[^.]*)',
-            r'(shipped[^.]*)',
-            r'(delivered[^.]*)',
-            r'(expected[^.]*)',
-            r'(estimated[^.]*)'
-        ]
-        
-        for pattern in delivery_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        # Look for delivery-related information. The patterns are tried in
+        # priority order rather than as one alternation, which would return
+        # whichever phrase comes first in the text instead.
+        if DELIVERY_KEYWORDS_RE.search(text):
+            for pattern in DELIVERY_PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    return match.group(1).strip()
         
         # Look for date patterns
-        date_patterns = [
-            r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-            r'(\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{2,4})',
-            r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2},?\s+\d{2,4})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in DELIVERY_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return f"Expected {match.group(1)}"
         
         return None
     
-    def parse_delivery_date(self, date_text: str) -> Optional[date]:
-        """Parse IKEA delivery date format."""
+    def parse_delivery_date(self, date_text: str, today: Optional[date] = None) -> Optional[date]:
+        """Parse IKEA delivery date format, resolving relative dates against today."""
         if not date_text:
             return None
         
-        today = datetime.now().date()
         lower_text = date_text.lower().strip()
         
         # Skip delivered orders - be more specific to avoid false positives
         if lower_text.startswith('delivered') or ' delivered ' in lower_text and 'will be delivered' not in lower_text:
             return None
         
-        # Handle "today"
-        if "today" in lower_text:
-            return today
-        
-        # Handle "tomorrow"
-        if "tomorrow" in lower_text:
-            tomorrow = today + timedelta(days=1)
-            return tomorrow
-        
-        # Handle relative days like "in 3 days", "within 5 days"
-        days_match = re.search(r'(?:in|within)\s+(\d+)\s+days?', lower_text)
-        if days_match:
-            days = int(days_match.group(1))
-            target_date = today + timedelta(days=days)
-            return target_date
-        
-        # Handle weekdays
-        weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        for i, day_name in enumerate(weekdays):
-            if day_name in lower_text:
-                days_ahead = (i - today.weekday() + 7) % 7
-                if days_ahead == 0:
-                    days_ahead = 7
-                target_date = today + timedelta(days=days_ahead)
-                return target_date
-        
-        # Handle specific date formats - prioritize patterns with explicit years
-        date_patterns = [
-            # DD Month YYYY format (with explicit year)
-            (r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{4})', '%d %b %Y'),
-            # Month DD, YYYY format (with explicit year)
-            (r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2}),?\s+(\d{4})', '%b %d %Y'),
-            # DD/MM/YYYY, DD-MM-YYYY
-            (r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})', '%d/%m/%Y'),
-            # DD/MM/YY, DD-MM-YY
-            (r'(\d{1,2})[-/](\d{1,2})[-/](\d{2})', '%d/%m/%y'),
-            # DD Month (current year) - only after explicit year patterns
-            (r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*(?!\s+\d{4})', '%d %b'),
-        ]
+        # Every format _parse_delivery_date knows needs a digit, a relative
+        # day or a weekday name
+        if not DATE_HINT_RE.search(lower_text):
+            return None
         
-        for pattern, date_format in date_patterns:
-            match = re.search(pattern, lower_text)
-            if match:
-                try:
-                    if date_format == '%d %b':
-                        # For patterns without year, assume current year
-                        date_str = f"{match.group(1)} {match.group(2)} {today.year}"
-                        parsed_date = datetime.strptime(date_str, '%d %b %Y').date()
-                    elif date_format == '%d %b %Y':
-                        # DD Month YYYY format
-                        date_str = f"{match.group(1)} {match.group(2)} {match.group(3)}"
-                        parsed_date = datetime.strptime(date_str, '%d %b %Y').date()
-                    elif date_format == '%b %d %Y':
-                        # Month DD, YYYY format
-                        date_str = f"{match.group(1)} {match.group(2)} {match.group(3)}"
-                        parsed_date = datetime.strptime(date_str, '%b %d %Y').date()
-                    elif date_format == '%d/%m/%Y':
-                        # DD/MM/YYYY format
-                        date_str = f"{match.group(1)}/{match.group(2)}/{match.group(3)}"
-                        parsed_date = datetime.strptime(date_str, '%d/%m/%Y').date()
-                    elif date_format == '%d/%m/%y':
-                        # DD/MM/YY format - handle 2-digit year
-                        year = int(match.group(3))
-                        if year < 50:
-                            year += 2000
-                        else:
-                            year += 1900
-                        date_str = f"{match.group(1)}/{match.group(2)}/{year}"
-                        parsed_date = datetime.strptime(date_str, '%d/%m/%Y').date()
-                    else:
-                        continue
-                    return parsed_date
-                except ValueError:
-                    continue
-        return None
+        if today is None:
+            today = date.today()
+        return _parse_delivery_date(lower_text, today)
+
+    def parse_delivery_dates(self, date_texts: List[str], today: Optional[date] = None) -> List[Optional[date]]:
+        """
+        Parse a batch of IKEA delivery date strings against a single today.
+
+        Args:
+            date_texts: Delivery date strings, e.g. from a page of orders
+            today: Date to resolve relative dates against, defaults to the current date
+
+        Returns:
+            Parsed dates in the same order as date_texts, None where unparseable
+        """
+        if today is None:
+            today = date.today()
+        parse = self.parse_delivery_date
+        return [parse(date_text, today) for date_text in date_texts]
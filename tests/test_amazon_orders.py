@@ -1,6 +1,9 @@
+import os
+import json
 import pytest
-from datetime import datetime, date, timedelta
-from scrapers.amazon import parse_delivery_date
+from datetime import datetime, date, time, timedelta
+from bs4 import BeautifulSoup
+from scrapers.amazon import AmazonScraper, parse_delivery_date, _parse_delivery_date, _order_id
 
 
 class TestParseDeliveryDate:
@@ -9,13 +12,13 @@ class TestParseDeliveryDate:
     def test_arriving_today_no_time(self):
         """Test parsing 'Arriving today' without time."""
         result = parse_delivery_date("Arriving today")
-        expected_date = datetime.now().date()
+        expected_date = date.today()
         assert result == (expected_date, None)
 
     def test_arriving_today_with_time(self):
         """Test parsing 'Arriving today' with time range."""
         result = parse_delivery_date("Arriving today 10am - 2pm")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("10am", "%I%p").time())
         expected_end = datetime.combine(today, datetime.strptime("2pm", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -23,7 +26,7 @@ class TestParseDeliveryDate:
     def test_arriving_today_with_minutes(self):
         """Test parsing 'Arriving today' with time range including minutes."""
         result = parse_delivery_date("Arriving today 10:30am - 2:15pm")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("10:30am", "%I:%M%p").time())
         expected_end = datetime.combine(today, datetime.strptime("2:15pm", "%I:%M%p").time())
         assert result == (expected_start, expected_end)
@@ -31,13 +34,13 @@ class TestParseDeliveryDate:
     def test_arriving_tomorrow_no_time(self):
         """Test parsing 'Arriving tomorrow' without time."""
         result = parse_delivery_date("Arriving tomorrow")
-        expected_date = datetime.now().date() + timedelta(days=1)
+        expected_date = date.today() + timedelta(days=1)
         assert result == (expected_date, None)
 
     def test_arriving_tomorrow_with_time(self):
         """Test parsing 'Arriving tomorrow' with time range."""
         result = parse_delivery_date("Arriving tomorrow 9am - 1pm")
-        tomorrow = datetime.now().date() + timedelta(days=1)
+        tomorrow = date.today() + timedelta(days=1)
         expected_start = datetime.combine(tomorrow, datetime.strptime("9am", "%I%p").time())
         expected_end = datetime.combine(tomorrow, datetime.strptime("1pm", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -45,7 +48,7 @@ class TestParseDeliveryDate:
     def test_arriving_weekday_no_time(self):
         """Test parsing 'Arriving [weekday]' without time."""
         result = parse_delivery_date("Arriving Sunday")
-        today = datetime.now().date()
+        today = date.today()
         # Calculate next Sunday
         days_ahead = (6 - today.weekday() + 7) % 7
         if days_ahead == 0:
@@ -56,7 +59,7 @@ class TestParseDeliveryDate:
     def test_arriving_weekday_with_time(self):
         """Test parsing 'Arriving [weekday]' with time range."""
         result = parse_delivery_date("Arriving Friday 11am - 3pm")
-        today = datetime.now().date()
+        today = date.today()
         # Calculate next Friday
         days_ahead = (4 - today.weekday() + 7) % 7
         if days_ahead == 0:
@@ -68,7 +71,7 @@ class TestParseDeliveryDate:
 
     def test_date_range_no_time(self):
         """Test parsing date ranges like '16 July - 19 July'."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("16 July - 19 July")
         expected_start = date(current_year, 7, 16)
         expected_end = date(current_year, 7, 20)  # End date is exclusive, so add 1 day
@@ -76,7 +79,7 @@ class TestParseDeliveryDate:
 
     def test_date_range_abbreviated_month(self):
         """Test parsing date ranges with abbreviated month names."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("5 Dec - 8 Dec")
         expected_start = date(current_year, 12, 5)
         expected_end = date(current_year, 12, 9)  # End date is exclusive, so add 1 day
@@ -90,14 +93,14 @@ class TestParseDeliveryDate:
 
     def test_specific_date_current_year(self):
         """Test parsing specific dates without year (assumes current year)."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("25 March")
         expected_date = date(current_year, 3, 25)
         assert result == (expected_date, None)
 
     def test_specific_date_with_time(self):
         """Test parsing specific dates with time range."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("25 March 8am - 12pm")
         target_date = date(current_year, 3, 25)
         expected_start = datetime.combine(target_date, datetime.strptime("8am", "%I%p").time())
@@ -107,14 +110,14 @@ class TestParseDeliveryDate:
     def test_delivered_order_skipped(self):
         """Test that delivered orders return None (should be skipped)."""
         result = parse_delivery_date("Delivered 9 July")
-        current_year = datetime.now().year
+        current_year = date.today().year
         expected_date = date(current_year, 7, 9)
         assert result == (expected_date, None)
 
     def test_time_range_with_dash(self):
         """Test parsing time ranges with regular dash."""
         result = parse_delivery_date("Arriving today 2pm - 6pm")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("2pm", "%I%p").time())
         expected_end = datetime.combine(today, datetime.strptime("6pm", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -122,7 +125,7 @@ class TestParseDeliveryDate:
     def test_time_range_with_en_dash(self):
         """Test parsing time ranges with en-dash (–)."""
         result = parse_delivery_date("Arriving today 2pm – 6pm")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("2pm", "%I%p").time())
         expected_end = datetime.combine(today, datetime.strptime("6pm", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -130,7 +133,7 @@ class TestParseDeliveryDate:
     def test_time_range_no_spaces(self):
         """Test parsing time ranges without spaces around dash."""
         result = parse_delivery_date("Arriving today 10am-2pm")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("10am", "%I%p").time())
         expected_end = datetime.combine(today, datetime.strptime("2pm", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -148,13 +151,13 @@ class TestParseDeliveryDate:
     def test_case_insensitive(self):
         """Test that parsing is case insensitive."""
         result = parse_delivery_date("ARRIVING TODAY")
-        expected_date = datetime.now().date()
+        expected_date = date.today()
         assert result == (expected_date, None)
 
     def test_mixed_case_with_time(self):
         """Test mixed case input with time range."""
         result = parse_delivery_date("Arriving TODAY 10AM - 2PM")
-        today = datetime.now().date()
+        today = date.today()
         expected_start = datetime.combine(today, datetime.strptime("10AM", "%I%p").time())
         expected_end = datetime.combine(today, datetime.strptime("2PM", "%I%p").time())
         assert result == (expected_start, expected_end)
@@ -162,26 +165,152 @@ class TestParseDeliveryDate:
     def test_time_parsing_failure_fallback(self):
         """Test that invalid time formats fall back to date-only parsing."""
         result = parse_delivery_date("Arriving today 25am - 30pm")  # Invalid times
-        expected_date = datetime.now().date()
+        expected_date = date.today()
         assert result == (expected_date, None)
 
+    def test_noon_and_midnight_times(self):
+        """Test that 12am and 12pm map to midnight and noon."""
+        result = parse_delivery_date("Arriving today 12am - 12pm")
+        today = date.today()
+        assert result == (datetime.combine(today, time(0, 0)), datetime.combine(today, time(12, 0)))
+
     def test_now_expected_by_date(self):
         """Test parsing 'now expected by [date]' format."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("now expected by 19 july")
         expected_date = date(current_year, 7, 19)
         assert result == (expected_date, None)
 
     def test_now_expected_by_date_abbreviated(self):
         """Test parsing 'now expected by [date]' format with abbreviated month."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("now expected by 25 dec")
         expected_date = date(current_year, 12, 25)
         assert result == (expected_date, None)
 
     def test_now_expected_by_case_insensitive(self):
         """Test that 'now expected by' parsing is case insensitive."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         result = parse_delivery_date("Now Expected By 15 March")
         expected_date = date(current_year, 3, 15)
         assert result == (expected_date, None)
+
+    def test_explicit_today(self):
+        """Test that relative dates resolve against an explicit today."""
+        result = parse_delivery_date("Arriving tomorrow", today=date(2025, 12, 31))
+        assert result == (date(2026, 1, 1), None)
+
+    def test_cached_parse_respects_today(self):
+        """Test that cached results are keyed on the current date."""
+        first = _parse_delivery_date("Arriving tomorrow", date(2025, 1, 1))
+        second = _parse_delivery_date("Arriving tomorrow", date(2025, 1, 2))
+        assert first == (date(2025, 1, 2), None)
+        assert second == (date(2025, 1, 3), None)
+
+    def test_out_of_range_day(self):
+        """Test that an impossible day of month returns None."""
+        result = parse_delivery_date("Arriving 32 July")
+        assert result == (None, None)
+
+
+class TestAmazonCardDetails:
+    """Test extraction of links and products from an order card."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.scraper = AmazonScraper("test@example.com", "password")
+
+    def _card(self, html):
+        return BeautifulSoup(html, 'lxml').find('div')
+
+    def test_delivery_status(self):
+        """Test that the bold text of the status block is found."""
+        card = self._card(
+            '<div><div class="a-row">Arriving <span class="a-text-bold">Arriving tomorrow</span></div>'
+            '<div class="yohtmlc-product-title">Wireless Mouse</div></div>'
+        )
+        assert self.scraper._find_delivery_status(card).text == "Arriving tomorrow"
+        assert self.scraper._find_delivery_status(self._card('<div><span class="a-text-bold">Mouse</span></div>')) is None
+
+    def test_delivery_status_first_block_wins(self):
+        """Test that only the first status block is used when two blocks match."""
+        card = self._card(
+            '<div><span>Delivered items may ship separately</span>'
+            '<div>Arriving <span class="a-text-bold">Arriving tomorrow</span></div></div>'
+        )
+        assert self.scraper._find_delivery_status(card) is None
+
+        card = self._card(
+            '<div><div>Now expected <span class="a-text-bold">now expected by 19 July</span></div>'
+            '<div>Arriving <span class="a-text-bold">Arriving tomorrow</span></div></div>'
+        )
+        assert self.scraper._find_delivery_status(card).text == "now expected by 19 July"
+
+    def test_order_link_and_product_titles(self):
+        """Test that the order link and product title blocks are found."""
+        card = self._card(
+            '<div><a href="/gp/your-account/order-details?orderID=1">View order details</a>'
+            '<div class="yohtmlc-product-title">Wireless Mouse</div>'
+            '<a class="a-link-normal" href="/dp/1">Wireless Mouse</a></div>'
+        )
+        details = self.scraper._extract_card_details(card)
+        assert details['order_link'] == 'https://www.amazon.in/gp/your-account/order-details?orderID=1'
+        assert [e.text for e in details['product_elements']] == ['Wireless Mouse']
+
+    def test_falls_back_to_product_links(self):
+        """Test that product links are used when no title blocks exist."""
+        card = self._card(
+            '<div><a class="a-link-normal" href="/dp/1">Short</a>'
+            '<a class="a-link-normal" href="/dp/2">USB-C Charging Cable</a></div>'
+        )
+        details = self.scraper._extract_card_details(card)
+        assert details['order_link'] is None
+        assert [e.text for e in details['product_elements']] == ['USB-C Charging Cable']
+
+    def test_order_id_from_link(self):
+        """Test that the order id is read from the order details link."""
+        assert _order_id('https://www.amazon.in/gp/your-account/order-details?orderID=406-1&ref=x') == '406-1'
+        assert _order_id('https://www.amazon.in/gp/your-account/order-details') is None
+        assert _order_id(None) is None
+
+    def test_parse_delivery_date_method(self):
+        """Test that the scraper method returns the start day as YYYY-MM-DD."""
+        today = date(2025, 7, 16)
+        assert self.scraper.parse_delivery_date("Arriving tomorrow 9am - 1pm", today) == "2025-07-17"
+        assert self.scraper.parse_delivery_date("16 July - 19 July", today) == "2025-07-16"
+        assert self.scraper.parse_delivery_date("Not a date", today) is None
+
+
+class TestAmazonSessionCookies:
+    """Test saving and restoring the Amazon session cookies."""
+
+    class FakeDriver:
+        def __init__(self, cookies=()):
+            self.cookies = list(cookies)
+
+        def get_cookies(self):
+            return self.cookies
+
+        def add_cookie(self, cookie):
+            self.cookies.append(cookie)
+
+    def test_cookies_saved_privately(self, tmp_path):
+        """Test that session cookies go to the state directory, readable only by the owner."""
+        cookies = [{'name': "session-id", 'value': "secret"}]
+        output_dir = tmp_path / "output"
+        state_dir = tmp_path / "state"
+        scraper = AmazonScraper("test@example.com", "password", output_dir=str(output_dir),
+                                driver=self.FakeDriver(cookies), state_dir=str(state_dir))
+        scraper.save_cookies()
+
+        cookies_file = state_dir / "amazonscraper_cookies.json"
+        assert json.loads(cookies_file.read_text()) == cookies
+        assert os.stat(cookies_file).st_mode & 0o777 == 0o600
+        assert os.stat(state_dir).st_mode & 0o077 == 0
+        assert list(output_dir.iterdir()) == []
+
+        # A later run restores them into a fresh browser
+        restored = AmazonScraper("test@example.com", "password", output_dir=str(output_dir),
+                                 driver=self.FakeDriver(), state_dir=str(state_dir))
+        assert restored.load_cookies() is True
+        assert restored.driver.cookies == cookies
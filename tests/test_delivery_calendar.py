@@ -0,0 +1,267 @@
+import asyncio
+import pytest
+from datetime import datetime, date
+import delivery_calendar
+import scrapers.base
+from delivery_calendar import generate_ics_file, _fold_line, _load_class, _max_concurrent_scrapers, SCRAPERS
+from scrapers.base import Scraper
+
+
+class TestGenerateIcsFile:
+    """Test ICS serialization of scraped orders."""
+
+    def _generate(self, tmp_path, orders):
+        output_file = tmp_path / "calendar.ics"
+        generate_ics_file(orders, str(output_file), str(tmp_path / "state"))
+        return output_file.read_bytes().decode("utf-8")
+
+    def test_all_day_event(self, tmp_path):
+        """Test that date-only orders become all-day events."""
+        content = self._generate(tmp_path, [{
+            'title': "🛋️ IKEA: Bookcase",
+            'start_date': date(2025, 7, 16),
+        }])
+        assert "DTSTART;VALUE=DATE:20250716\r\n" in content
+        assert "DTEND" not in content
+        assert content.count("BEGIN:VEVENT") == 1
+
+    def test_all_day_event_with_range(self, tmp_path):
+        """Test that date ranges keep their exclusive end date."""
+        content = self._generate(tmp_path, [{
+            'title': "📦 Amazon: Desk Lamp",
+            'start_date': date(2025, 7, 16),
+            'end_date': date(2025, 7, 20),
+        }])
+        assert "DTSTART;VALUE=DATE:20250716\r\n" in content
+        assert "DTEND;VALUE=DATE:20250720\r\n" in content
+        assert "SUMMARY:📦 Amazon: Desk Lamp\r\n" in content
+
+    def test_timed_event(self, tmp_path):
+        """Test that delivery windows are emitted as floating local times."""
+        content = self._generate(tmp_path, [{
+            'title': "📦 Amazon: Kettle",
+            'start_date': datetime(2025, 7, 16, 10, 0),
+            'end_date': datetime(2025, 7, 16, 14, 30),
+            'order_link': "https://www.amazon.in/gp/your-account/order-details?orderID=1",
+        }])
+        assert "DTSTART:20250716T100000\r\n" in content
+        assert "DTEND:20250716T143000\r\n" in content
+        assert "DESCRIPTION:Order details: https://www.amazon.in/gp/your-account/order-details?orderID=1\r\n" in content.replace("\r\n ", "")
+
+    def test_text_is_escaped(self, tmp_path):
+        """Test that commas and semicolons in titles are escaped."""
+        content = self._generate(tmp_path, [{
+            'title': "Chair, oak; set of 2",
+            'start_date': date(2025, 7, 16),
+        }])
+        assert "SUMMARY:Chair\\, oak\\; set of 2\r\n" in content
+
+    def test_orders_without_dates_are_skipped(self, tmp_path):
+        """Test that orders without a start date produce no events."""
+        content = self._generate(tmp_path, [{'title': "🛋️ IKEA: Order 1", 'start_date': None}])
+        assert content.startswith("BEGIN:VCALENDAR\r\n")
+        assert content.endswith("END:VCALENDAR\r\n")
+        assert "BEGIN:VEVENT" not in content
+
+    def test_existing_file_replaced(self, tmp_path):
+        """Test that regenerating replaces the calendar, leaving no temp or hash file beside it."""
+        output_file = tmp_path / "calendar.ics"
+        output_file.write_text("stale")
+        generate_ics_file([{'title': "Lamp", 'start_date': date(2025, 7, 16)}], str(output_file), str(tmp_path / "state"))
+        assert output_file.read_bytes().startswith(b"BEGIN:VCALENDAR\r\n")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["calendar.ics", "state"]
+        assert [p.name for p in (tmp_path / "state").iterdir()] == ["calendar.ics.hash"]
+
+    def test_uids_are_stable(self, tmp_path):
+        """Test that the same order gets the same UID on every run."""
+        order = {
+            'title': "📦 Amazon: Kettle",
+            'start_date': date(2025, 7, 16),
+            'order_link': "https://www.amazon.in/gp/your-account/order-details?orderID=1",
+        }
+        first = generate_ics_file([order], str(tmp_path / "a.ics"), str(tmp_path / "state"))
+        second = generate_ics_file([order], str(tmp_path / "b.ics"), str(tmp_path / "state"))
+        uids = [
+            next(line for line in (tmp_path / name).read_text().splitlines() if line.startswith("UID:"))
+            for name in ("a.ics", "b.ics")
+        ]
+        assert first and second
+        assert uids[0] == uids[1]
+        assert uids[0].endswith("@delivery-calendar")
+
+    def test_uids_distinguish_items_and_ignore_position(self, tmp_path):
+        """Test that identical items in one order get distinct UIDs, and orders without ids use their delivery text."""
+        link = "https://www.amazon.in/gp/your-account/order-details?orderID=1"
+        orders = [
+            {'title': "📦 Amazon: Mug", 'start_date': date(2025, 7, 16), 'order_link': link, 'item_index': 0},
+            {'title': "📦 Amazon: Mug", 'start_date': date(2025, 7, 16), 'order_link': link, 'item_index': 1},
+            {'title': "🛋️ IKEA: Order", 'start_date': date(2025, 7, 16), 'order_id': None, 'status': "Delivery today"},
+            {'title': "🛋️ IKEA: Order", 'start_date': date(2025, 7, 17), 'order_id': None, 'status': "Delivery tomorrow"},
+        ]
+
+        def uids(orders, name):
+            generate_ics_file(orders, str(tmp_path / name), str(tmp_path / "state"))
+            return [line for line in (tmp_path / name).read_text().splitlines() if line.startswith("UID:")]
+
+        first = uids(orders, "a.ics")
+        assert len(set(first)) == 4
+        # Reordering the page must not change any event's UID
+        assert sorted(uids(orders[::-1], "b.ics")) == sorted(first)
+
+    def test_uids_unique_for_identical_orders(self, tmp_path):
+        """Test that id-less orders with the same title and status still get distinct UIDs."""
+        order = {'title': "🛋️ IKEA: Order", 'start_date': date(2025, 7, 16), 'order_id': None, 'status': "Delivery today"}
+        content = self._generate(tmp_path, [order, dict(order)])
+        uids = [line for line in content.splitlines() if line.startswith("UID:")]
+        assert len(uids) == 2
+        assert uids[0] != uids[1]
+
+    def test_unchanged_calendar_not_rewritten(self, tmp_path):
+        """Test that regenerating identical events skips the write."""
+        output_file = tmp_path / "calendar.ics"
+        orders = [{'title': "Lamp", 'start_date': date(2025, 7, 16)}]
+        assert generate_ics_file(orders, str(output_file), str(tmp_path / "state")) is True
+        assert generate_ics_file(orders, str(output_file), str(tmp_path / "state")) is False
+        orders.append({'title': "Desk", 'start_date': date(2025, 7, 17)})
+        assert generate_ics_file(orders, str(output_file), str(tmp_path / "state")) is True
+        assert "SUMMARY:Desk" in output_file.read_text()
+
+
+class TestFoldLine:
+    """Test RFC 5545 line folding."""
+
+    def test_short_line_unchanged(self):
+        """Test that lines within the limit are not folded."""
+        assert _fold_line("SUMMARY:Short") == "SUMMARY:Short"
+
+    def test_long_line_folded(self):
+        """Test that long lines are folded at 75 octets without splitting characters."""
+        line = "SUMMARY:" + "📦" * 40
+        folded = _fold_line(line)
+        parts = folded.split("\r\n")
+        assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+        assert all(part.startswith(" ") for part in parts[1:])
+        assert folded.replace("\r\n ", "") == line
+
+
+class TestScraperRegistry:
+    """Test the lazily imported retailer registry."""
+
+    def test_registry_classes_resolve(self):
+        """Test that every registered scraper path imports a Scraper subclass."""
+        for retailer in SCRAPERS:
+            assert issubclass(_load_class(retailer['cls']), Scraper), retailer['name']
+
+
+class TestMaxConcurrentScrapers:
+    """Test parsing of the MAX_CONCURRENT_SCRAPERS limit."""
+
+    def test_default(self, monkeypatch):
+        """Test that an unset limit defaults to 8."""
+        monkeypatch.delenv("MAX_CONCURRENT_SCRAPERS", raising=False)
+        assert _max_concurrent_scrapers() == 8
+
+    def test_valid_value(self, monkeypatch):
+        """Test that a positive limit is used as is."""
+        monkeypatch.setenv("MAX_CONCURRENT_SCRAPERS", "3")
+        assert _max_concurrent_scrapers() == 3
+
+    def test_clamped_to_one(self, monkeypatch):
+        """Test that zero and negative limits are raised to 1 instead of deadlocking."""
+        for value in ("0", "-2"):
+            monkeypatch.setenv("MAX_CONCURRENT_SCRAPERS", value)
+            assert _max_concurrent_scrapers() == 1
+
+    def test_invalid_value(self, monkeypatch):
+        """Test that a non-numeric limit falls back to the default."""
+        monkeypatch.setenv("MAX_CONCURRENT_SCRAPERS", "many")
+        assert _max_concurrent_scrapers() == 8
+
+
+class FakeDriver:
+    """Stand-in for a shared Chrome instance that records what was done to it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.calls.append(cmd)
+
+    def quit(self):
+        self.calls.append("quit")
+
+
+class FakeScraper:
+    """Scraper stand-in returning one order per run, or crashing if asked to."""
+
+    def __init__(self, email, password, output_dir, state_dir, driver=None):
+        self.email = email
+        self.driver = driver
+
+    def run(self):
+        if self.email == "crash":
+            raise RuntimeError("boom")
+        return [{'title': f"Order for {self.email}", 'start_date': date(2025, 7, 16)}]
+
+
+class TestRunCheck:
+    """Test a full check with fake scrapers and browser."""
+
+    @pytest.fixture
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(delivery_calendar, "SCRAPERS", [
+            {'name': name, 'cls': "fake",
+             'credentials': {'email': f"{name}_EMAIL", 'password': f"{name}_PASSWORD"}}
+            for name in ("A", "B")
+        ])
+        monkeypatch.setattr(delivery_calendar, "_load_class", lambda path: FakeScraper)
+        drivers = []
+
+        def create_driver():
+            drivers.append(FakeDriver())
+            return drivers[-1]
+
+        monkeypatch.setattr(scrapers.base, "create_driver", create_driver)
+        for name in ("A", "B"):
+            monkeypatch.delenv(f"{name}_EMAIL", raising=False)
+            monkeypatch.setenv(f"{name}_PASSWORD", "password")
+        return tmp_path, drivers
+
+    def test_concurrent(self, setup, monkeypatch):
+        """Test that each retailer runs with its own browser and lands in the calendar."""
+        tmp_path, drivers = setup
+        monkeypatch.setenv("A_EMAIL", "a@example.com")
+        monkeypatch.setenv("B_EMAIL", "b@example.com")
+        asyncio.run(delivery_calendar.run_check())
+        content = (tmp_path / "output" / "calendar.ics").read_text()
+        assert "Order for a@example.com" in content and "Order for b@example.com" in content
+        assert drivers == []
+
+    def test_shared_browser(self, setup, monkeypatch):
+        """Test that one browser is shared, cleared between retailers and always quit."""
+        tmp_path, drivers = setup
+        monkeypatch.setenv("A_EMAIL", "crash")
+        monkeypatch.setenv("B_EMAIL", "b@example.com")
+        asyncio.run(delivery_calendar.run_check(share_browser=True))
+        assert len(drivers) == 1
+        assert drivers[0].calls == ["Network.clearBrowserCookies", "Network.clearBrowserCookies", "quit"]
+        assert "Order for b@example.com" in (tmp_path / "output" / "calendar.ics").read_text()
+
+    def test_shared_browser_not_launched_without_retailers(self, setup):
+        """Test that no browser starts when no retailer has credentials."""
+        _, drivers = setup
+        asyncio.run(delivery_calendar.run_check(share_browser=True))
+        assert drivers == []
+
+    def test_shared_browser_quit_when_construction_fails(self, setup, monkeypatch):
+        """Test that the shared browser is quit even if a scraper can't be built."""
+        _, drivers = setup
+        monkeypatch.setenv("A_EMAIL", "a@example.com")
+
+        def broken(**kwargs):
+            raise TypeError("bad scraper")
+
+        monkeypatch.setattr(delivery_calendar, "_load_class", lambda path: broken)
+        asyncio.run(delivery_calendar.run_check(share_browser=True))
+        assert drivers[0].calls[-1] == "quit"
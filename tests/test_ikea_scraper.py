@@ -1,18 +1,22 @@
+import os
 import pytest
-from datetime import datetime, date, timedelta
-from scrapers.ikea import IkeaScraper
+from datetime import date, timedelta
+from bs4 import BeautifulSoup
+from scrapers.ikea import IkeaScraper, _find_fallback_containers
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    """Share one scraper across the parsing tests; none of them mutate it."""
+    return IkeaScraper("test@example.com", "password")
 
 
 class TestIkeaScraperDateParsing:
     """Test IKEA delivery date parsing functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.scraper = IkeaScraper("test@example.com", "password")
-    
-    def test_parse_delivery_date_today(self):
+    def test_parse_delivery_date_today(self, scraper):
         """Test parsing 'today' delivery dates."""
-        today = datetime.now().date()
+        today = date.today()
         expected = today
         
         test_cases = [
@@ -24,12 +28,12 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for case: {case}"
     
-    def test_parse_delivery_date_tomorrow(self):
+    def test_parse_delivery_date_tomorrow(self, scraper):
         """Test parsing 'tomorrow' delivery dates."""
-        tomorrow = datetime.now().date() + timedelta(days=1)
+        tomorrow = date.today() + timedelta(days=1)
         expected = tomorrow
         
         test_cases = [
@@ -41,12 +45,12 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for case: {case}"
     
-    def test_parse_delivery_date_relative_days(self):
+    def test_parse_delivery_date_relative_days(self, scraper):
         """Test parsing relative day formats."""
-        today = datetime.now().date()
+        today = date.today()
         
         test_cases = [
             ("Delivery in 3 days", 3),
@@ -58,12 +62,46 @@ class TestIkeaScraperDateParsing:
         
         for case, days in test_cases:
             expected = today + timedelta(days=days)
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for case: {case}"
-    
-    def test_parse_delivery_date_weekdays(self):
+
+    def test_parse_delivery_date_explicit_today(self, scraper):
+        """Test that relative dates resolve against an explicit today."""
+        today = date(2025, 7, 16)  # Wednesday
+
+        assert scraper.parse_delivery_date("Delivery today", today) == today
+        assert scraper.parse_delivery_date("Delivery tomorrow", today) == date(2025, 7, 17)
+        assert scraper.parse_delivery_date("Delivery in 3 days", today) == date(2025, 7, 19)
+        assert scraper.parse_delivery_date("Expected Friday", today) == date(2025, 7, 18)
+        assert scraper.parse_delivery_date("Expected 5 Aug", today) == date(2025, 8, 5)
+
+    def test_cached_parse_respects_today(self, scraper):
+        """Test that repeated text is re-resolved when today changes."""
+        assert scraper.parse_delivery_date("Delivery tomorrow", date(2025, 7, 16)) == date(2025, 7, 17)
+        assert scraper.parse_delivery_date("Delivery tomorrow", date(2025, 7, 17)) == date(2025, 7, 18)
+        assert scraper.parse_delivery_date("DELIVERY TOMORROW", date(2025, 7, 17)) == date(2025, 7, 18)
+
+    def test_parse_delivery_dates_batch(self, scraper):
+        """Test that batch parsing matches parsing each text on its own."""
+        today = date(2025, 7, 16)
+        texts = ["Delivery tomorrow", "Delivered 15/12/2024", None, "Expected 5 Aug", "Order details"]
+
+        assert scraper.parse_delivery_dates(texts, today) == [
+            scraper.parse_delivery_date(text, today) for text in texts
+        ]
+        assert scraper.parse_delivery_dates(texts, today) == [date(2025, 7, 17), None, None, date(2025, 8, 5), None]
+        assert scraper.parse_delivery_dates([]) == []
+
+    def test_parse_delivery_date_impossible_dates(self, scraper):
+        """Test that impossible dates fall through to later patterns or None."""
+        today = date(2025, 7, 16)
+
+        assert scraper.parse_delivery_date("Expected 31/02/2025 or 15 Mar 2025", today) == date(2025, 3, 15)
+        assert scraper.parse_delivery_date("Expected 30 feb", today) is None
+
+    def test_parse_delivery_date_weekdays(self, scraper):
         """Test parsing weekday delivery dates."""
-        today = datetime.now().date()
+        today = date.today()
         weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
         
         for i, day_name in enumerate(weekdays):
@@ -81,10 +119,10 @@ class TestIkeaScraperDateParsing:
             ]
             
             for case in test_cases:
-                result = self.scraper.parse_delivery_date(case)
+                result = scraper.parse_delivery_date(case)
                 assert result == expected, f"Failed for case: {case} (expected {expected})"
     
-    def test_parse_delivery_date_specific_formats(self):
+    def test_parse_delivery_date_specific_formats(self, scraper):
         """Test parsing specific date formats."""
         test_cases = [
             # DD/MM/YYYY format
@@ -99,6 +137,7 @@ class TestIkeaScraperDateParsing:
             # DD/MM/YY format
             ("Delivery 15/12/24", date(2024, 12, 15)),
             ("Arriving 03/01/25", date(2025, 1, 3)),
+            ("Arriving 03/01/99", date(1999, 1, 3)),
             
             # DD Month YYYY format
             ("Delivery 15 December 2024", date(2024, 12, 15)),
@@ -113,12 +152,12 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case, expected in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for case: {case} (got {result}, expected {expected})"
     
-    def test_parse_delivery_date_current_year_assumption(self):
+    def test_parse_delivery_date_current_year_assumption(self, scraper):
         """Test parsing dates without year (assumes current year)."""
-        current_year = datetime.now().year
+        current_year = date.today().year
         
         test_cases = [
             ("Delivery 15 December", date(current_year, 12, 15)),
@@ -128,10 +167,10 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case, expected in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for case: {case} (got {result}, expected {expected})"
     
-    def test_parse_delivery_date_delivered_orders(self):
+    def test_parse_delivery_date_delivered_orders(self, scraper):
         """Test that delivered orders return None."""
         test_cases = [
             "Delivered 15/12/2024",
@@ -142,10 +181,10 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result is None, f"Should return None for delivered order: {case}"
     
-    def test_parse_delivery_date_invalid_formats(self):
+    def test_parse_delivery_date_invalid_formats(self, scraper):
         """Test parsing invalid or unparseable date formats."""
         test_cases = [
             "",
@@ -158,38 +197,37 @@ class TestIkeaScraperDateParsing:
         ]
         
         for case in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result is None, f"Should return None for invalid format: {case}"
     
-    def test_parse_delivery_date_edge_cases(self):
+    def test_parse_delivery_date_edge_cases(self, scraper):
         """Test edge cases in date parsing."""
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        
         test_cases = [
             # Case insensitive
-            ("DELIVERY TODAY", datetime.now().date()),
-            ("delivery TOMORROW", datetime.now().date() + timedelta(days=1)),
+            ("DELIVERY TODAY", today),
+            ("delivery TOMORROW", tomorrow),
             
             # Extra whitespace
-            ("  delivery today  ", datetime.now().date()),
-            ("   arriving tomorrow   ", datetime.now().date() + timedelta(days=1)),
+            ("  delivery today  ", today),
+            ("   arriving tomorrow   ", tomorrow),
             
             # Mixed with other text
-            ("Your order will be delivered today at your address", datetime.now().date()),
-            ("Package arriving tomorrow between 9am-5pm", datetime.now().date() + timedelta(days=1)),
+            ("Your order will be delivered today at your address", today),
+            ("Package arriving tomorrow between 9am-5pm", tomorrow),
         ]
         
         for case, expected in test_cases:
-            result = self.scraper.parse_delivery_date(case)
+            result = scraper.parse_delivery_date(case)
             assert result == expected, f"Failed for edge case: {case}"
 
 
 class TestIkeaScraperMethods:
     """Test IKEA scraper utility methods."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.scraper = IkeaScraper("test@example.com", "password")
-    
-    def test_extract_order_id(self):
+    def test_extract_order_id(self, scraper):
         """Test order ID extraction."""
         test_cases = [
             ("Order #123456789", "123456789"),
@@ -203,10 +241,10 @@ class TestIkeaScraperMethods:
         ]
         
         for text, expected in test_cases:
-            result = self.scraper._extract_order_id(text)
+            result = scraper._extract_order_id(text)
             assert result == expected, f"Failed for text: {text} (got {result}, expected {expected})"
     
-    def test_extract_delivery_info(self):
+    def test_extract_delivery_info(self, scraper):
         """Test delivery information extraction."""
         test_cases = [
             ("Your order will be delivered tomorrow", "delivered tomorrow"),
@@ -219,11 +257,37 @@ class TestIkeaScraperMethods:
         ]
         
         for text, expected in test_cases:
-            result = self.scraper._extract_delivery_info(text)
+            result = scraper._extract_delivery_info(text)
             if expected:
                 assert result and expected.lower() in result.lower(), f"Failed for text: {text} (got {result}, expected to contain {expected})"
             else:
                 assert result is None, f"Should return None for text: {text}"
+
+    def test_extract_delivery_info_priority(self, scraper):
+        """Test that specific delivery phrases win over earlier generic ones."""
+        result = scraper._extract_delivery_info("Shipped. Expected delivery 15/12/2024")
+        assert result == "Expected delivery 15/12/2024"
+        assert scraper._extract_delivery_info("Ready 15/12/2024") == "Expected 15/12/2024"
+
+    def test_find_fallback_containers(self):
+        """Test that fallback containers match keywords split across tags, but not scripts."""
+        soup = BeautifulSoup(
+            '<section id="outer"><div id="split"><b>Deliv</b>ery by 12 Oct</div>'
+            '<div id="plain">Nothing here</div></section>'
+            '<article id="script"><script>var order = 1;</script></article>',
+            'lxml'
+        )
+        assert [elem['id'] for elem in _find_fallback_containers(soup)] == ["outer", "split"]
+
+    def test_extract_product_title(self, scraper):
+        """Test that product links win over headings, which win over text lines."""
+        def title(html):
+            element = BeautifulSoup(html, 'lxml').div
+            return scraper._extract_product_title(element, element.get_text("\n"))
+
+        assert title('<div><h2>Your purchase</h2><a>View order</a><a>BILLY Bookcase</a></div>') == "BILLY Bookcase"
+        assert title('<div><h2>POÄNG Armchair</h2><a>View order</a></div>') == "POÄNG Armchair"
+        assert title('<div><span>Paid</span><p>KALLAX Shelf unit</p></div>') == "KALLAX Shelf unit"
     
 
     # Plandex: removed code
@@ -245,3 +309,9 @@ class TestIkeaScraperInitialization:
         assert scraper.email == "test@example.com"
         assert scraper.password == "password"
         assert scraper.output_dir == "custom_output"
+
+    def test_session_data_outside_output_dir(self):
+        """Test that the Chrome profile and cookies live under the state directory."""
+        scraper = IkeaScraper("test@example.com", "password", output_dir="custom_output", state_dir="custom_state")
+        assert scraper.profile_dir.startswith(os.path.join("custom_state", ""))
+        assert scraper.cookies_file.startswith(os.path.join("custom_state", ""))